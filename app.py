@@ -1,17 +1,17 @@
-import google.generativeai as genai
 from dotenv import load_dotenv
 import json
+import logging
 import random
 import re
-import requests
-import base64
 from io import BytesIO
 import os
 import streamlit as st
-import elevenlabs
+import streamlit.components.v1 as components
 import io
 import time
-import tempfile
+import secrets
+import uuid
+from functools import partial
 from audio_recorder_streamlit import audio_recorder
 from io import StringIO
 import sys
@@ -22,11 +22,35 @@ import Interview_evaluation
 import stt
 import resume_parsing
 import jobrole_prediction
+from resume_document import ResumeDocument, ResumeTooLargeError
+from voice_pipeline import VoicePipeline, segment_html
+from audio_cache import audio_cache
+from media_server import media_server, MEDIA_STREAMING
+from opener_cache import opener_cache, opener_key
+from conversation_history import ConversationHistory
+from clients import clients
+from question_bank import question_bank, TopicPlanner
+from resilient_calls import call_sync, iter_with_timeout, CircuitOpenError, GEMINI_POLICY, SUMMARY_POLICY, TTS_POLICY, TTS_STREAM_POLICY, tts_breaker
 
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("interview")
+
+# Load the job-role model once per process; later reruns reuse it
+try:
+    jobrole_prediction.warm_up()
+except LookupError as e:
+    st.warning(str(e))
+except Exception as e:
+    # Missing or unreadable model files only affect resume uploads; manual entry still works
+    logger.warning("job-role model failed to load: %r", e)
+    st.warning(f"Job-role prediction is unavailable: {e}")
+# Local speech-to-text models load in the background, also once per process
+stt.warm_up()
+
 # 1. Configure the APIs
 def setup_voice(api_key):
     # ElevenLabs API key is set globally
@@ -36,12 +60,58 @@ if "voice_id" not in st.session_state:
     st.session_state.voice_id = ""
 # 2. Create the model instance
 def get_model_name(personality,prompt,api_key):
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel(
-        model_name='gemini-1.5-flash',  # or 'gemini-2.0-flash'
-        system_instruction=prompt
+    # Shared across sessions; the Gemini SDK is only imported when the first interview starts
+    return clients.gemini_model(api_key, system_instruction=prompt)
+
+
+# First turn of every interview
+OPENING_REQUEST = "Begin the interview: greet the candidate briefly without using their name and ask your first question."
+
+
+def opener_prompt(interviewer, key):
+    """System prompt for a cacheable opener, built only from what the cache key holds.
+
+    Openers are shared between candidates, so they must never come from the
+    session's own prompt with the candidate's name and resume details in it.
+    """
+    role, level, skills = key
+    prompt = f"""{interviewer['prompt']}
+    - The candidate is applying for a {role} position with {level} experience."""
+    if skills:
+        prompt += f"\n    - Candidate Skills: {', '.join(skills)}"
+    return prompt
+
+SUMMARY_INSTRUCTION = "You write short, factual notes about job interviews for the interviewer."
+
+def start_interview(interviewer, prompt, role, level, skills=()):
+    """Start the interview and show the opening question, from the question bank or opener cache when possible"""
+    model = get_model_name(interviewer, prompt, GEMINI_API_KEY)
+    summary_model = get_model_name(interviewer, SUMMARY_INSTRUCTION, GEMINI_API_KEY)
+    st.session_state.model = model
+    # Older turns are summarized in the background so requests stay within the token budget
+    st.session_state.chat = ConversationHistory(
+        summarizer=lambda request: call_sync(lambda: summary_model.generate_content(request).text, SUMMARY_POLICY)
     )
-    return model
+    # Openers and topic switches come from the offline question bank when it covers the role
+    planner = st.session_state.planner = TopicPlanner(question_bank, role, level)
+    key = opener_key(role, level, skills)
+    opener = planner.opener()
+    if opener is not None:
+        opener = f"Hello, and thank you for joining. Let's begin. {opener}"
+    else:
+        opener = opener_cache.get(key)
+    if opener is None:
+        opener_model = get_model_name(interviewer, opener_prompt(interviewer, key), GEMINI_API_KEY)
+        try:
+            opener = call_sync(lambda: opener_model.generate_content(OPENING_REQUEST).text, GEMINI_POLICY)
+            opener_cache.put(key, opener)
+        except Exception as e:
+            logger.warning("opening question failed: %s", e)
+            return
+    # The opener is seeded as the model's first turn so follow-ups build on it
+    st.session_state.chat.append("user", OPENING_REQUEST)
+    st.session_state.chat.append("model", opener)
+    st.session_state.messages.append({"role": "assistant", "content": opener})
 
 
 # Single professional interviewer configuration
@@ -83,10 +153,37 @@ if "chat" not in st.session_state:
 
 st.title("Welcome, Candidate!")
 st.markdown(":blue[This is an **AI Interview Assistant** designed to help you prepare for your upcoming interviews.]")
-def typewriter(text):
-    for word in text.split():
-        yield word + " "
-        time.sleep(0.1)  # Adjust speed
+def gemini_text(response, chunk_timeout=GEMINI_POLICY.chunk_timeout):
+    """Text of each streamed Gemini chunk; a stream that stalls mid-reply ends the reply early"""
+    try:
+        for chunk in iter_with_timeout(response, chunk_timeout):
+            try:
+                text = chunk.text
+            except ValueError:
+                continue  # a chunk without text parts, e.g. only a finish reason
+            if text:
+                yield text
+    except TimeoutError as e:
+        logger.warning("reply stream stalled: %s", e)
+        yield " ..."
+
+
+def stream_reply(texts, start, voice=None, on_audio=None):
+    """Yield the interviewer's reply as it arrives, logging time to first token.
+
+    With a VoicePipeline, each finished sentence goes to TTS while the rest is still streaming.
+    """
+    first = True
+    for text in texts:
+        if first:
+            logger.info("time to first token: %.0f ms", (time.perf_counter() - start) * 1000)
+            first = False
+        if voice:
+            voice.feed(text)
+            for segment in voice.ready():
+                on_audio(*segment)
+        yield text
+    logger.info("reply streamed in %.0f ms", (time.perf_counter() - start) * 1000)
 
 if "voice_id" not in st.session_state:
     st.session_state.voice_id = ""
@@ -105,13 +202,20 @@ with st.sidebar:
                 bytes_data = uploaded_file.getvalue()
                 interviewer = get_interviewer_config()
                 st.session_state.voice_id = interviewer["voice_id"]
-                info = resume_parsing.extract_clean_text(bytes_data)
-                job_prediction = jobrole_prediction.predict(bytes_data)
-                
-                # Extract the best match job role for the prompt (first job mentioned)
-                import re
-                best_match = re.search(r'\*\*(.*?)\*\*', job_prediction)
-                Job_Role = best_match.group(1) if best_match else "Software Engineer"
+                # Open the PDF once and share the extracted text between both steps
+                resume = ResumeDocument(bytes_data)
+                try:
+                    info = resume_parsing.extract_clean_text(resume)
+                except ResumeTooLargeError as e:
+                    st.error(str(e))
+                    st.stop()
+                try:
+                    predictions = jobrole_prediction.predict_batch([resume], k=2)[0]
+                    job_prediction = jobrole_prediction.format_prediction(predictions)
+                    Job_Role = predictions[0].role
+                except Exception as e:
+                    job_prediction = f"Prediction failed: {e}"
+                    Job_Role = "Software Engineer"
                 
                 prompt = f"""{interviewer['prompt']}
                 - Candidate Name: {info["name"]} applying for {Job_Role} position with {Experience} experience.
@@ -122,7 +226,7 @@ with st.sidebar:
                 - Provide relevant follow-ups based on answers.
                 - Keep responses concise (under 50 words when possible)."""
                 # 3. Start the chat session
-                st.session_state.chat = get_model_name(interviewer,prompt,GEMINI_API_KEY).start_chat(history=[])
+                start_interview(interviewer, prompt, Job_Role, Experience, info["skills"])
                 st.markdown(job_prediction)
                 st.write(info)
 
@@ -149,7 +253,7 @@ with st.sidebar:
                 - Keep responses concise (under 50 words when possible)."""
                 st.write(f"Interviewer: {interviewer['name']}")
                 # 3. Start the chat session
-                st.session_state.chat = get_model_name(interviewer,prompt,GEMINI_API_KEY).start_chat(history=[])
+                start_interview(interviewer, prompt, Job_Role, Experience)
     with tab3:
         st.header("Chat Controls")
         
@@ -245,40 +349,73 @@ for message in st.session_state.messages:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
-def generate_audio(text):
-    with st.spinner("Generating audio..."):                
+TTS_MODEL = "eleven_multilingual_v2"
+
+def synthesize(client, voice_id, text, stream=None):
+    """Audio for one sentence, from the disk cache when it has been spoken before; runs on the TTS worker pool.
+
+    With a media stream, chunks are written to it as ElevenLabs sends them so the browser can start playing.
+    """
+    audio = audio_cache.get(text, voice_id, TTS_MODEL)
+    if audio is not None:
+        if stream is not None:
+            stream.write(audio)
+            stream.close()
+        return audio
+    def convert():
+        if stream is not None and stream.size:
+            # Part of the clip is already playing; a retry would repeat it
+            raise RuntimeError("TTS stream interrupted")
+        chunks = []
+        # The audio is streamed, so the request only completes once it has been read
+        for chunk in client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=TTS_MODEL
+        ):
+            chunks.append(chunk)
+            if stream is not None:
+                stream.write(chunk)
+        return b"".join(chunks)
+    try:
+        audio = call_sync(convert, TTS_POLICY if stream is None else TTS_STREAM_POLICY, tts_breaker)
+    finally:
+        if stream is not None:
+            stream.close()
+    audio_cache.put(text, voice_id, TTS_MODEL, audio)
+    return audio
+
+
+def start_voice():
+    """A VoicePipeline for one reply, or None for a text-only reply"""
+    if not tts_breaker.available:
+        st.info("Voice is unavailable right now, so replies are text-only for a while.")
+        return None
+    try:
+        client = clients.elevenlabs(ELEVENLABS_API_KEY)
+    except Exception as e:
+        st.error(f"Audio generation failed: {str(e)}")
+        return None
+    # Audio is streamed from the media endpoint rather than inlined into the page when it's configured
+    open_stream = None
+    if MEDIA_STREAMING:
         try:
-            # Use the correct ElevenLabs API with client
-            from elevenlabs import ElevenLabs, play
-            
-            # Create client with API key
-            client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-            
-            # Generate audio using text_to_speech method
-            audio = client.text_to_speech.convert(
-                text=text,
-                voice_id=st.session_state.voice_id,
-                model_id="eleven_multilingual_v2"
-            )
-            
-            # Read audio bytes
-            audio_bytes = b"".join(audio)
-            
-            # Convert audio to base64 for autoplay
-            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-            del audio_bytes
-            
-            # Create autoplay audio element
-            audio_html = f"""
-            <audio autoplay>
-                <source src="data:audio/mpeg;base64,{audio_base64}" type="audio/mpeg">
-                Your browser does not support the audio element.
-            </audio>
-            """
-            st.markdown(audio_html, unsafe_allow_html=True)
-        except Exception as e:
-            st.error(f"Audio generation failed: {str(e)}")
-            # Continue without audio if there's an error
+            media_server.start()
+            session_id = st.session_state.setdefault("media_session", secrets.token_urlsafe(16))
+            open_stream = partial(media_server.open_stream, session_id)
+        except OSError as e:
+            logger.warning("media endpoint unavailable, sending audio inline: %s", e)
+    # Worker threads have no Streamlit context, so the voice is bound here
+    return VoicePipeline(partial(synthesize, client, st.session_state.voice_id), open_stream=open_stream)
+
+
+def play_segments(area, turn, errors, index, source, error):
+    # Every segment is queued, failed ones as a skip, so the browser player never stalls
+    if error is not None:
+        logger.warning("TTS segment %d failed: %r", index, error)
+        errors.append(error)
+    with area:
+        components.html(segment_html(turn, index, source), height=0)
 
 
 
@@ -292,11 +429,51 @@ def handle_message(input_text):
     
     # Generate bot response
     if st.session_state.chat:
-        assistant_prompt = st.session_state.chat.send_message(f"Candidate response: {input_text}\n Ask an appropriate follow-up question or a new question")
-        assistant_prompt = assistant_prompt.text
-        generate_audio(assistant_prompt)
+        history = st.session_state.chat
+        start = time.perf_counter()
+        planner = st.session_state.get("planner")
+        next_topic = planner.next_turn() if planner else None
+        if next_topic is not None:
+            # Topic switch straight from the question bank: no LLM round trip
+            request = f"Candidate response: {input_text}\n Move on to a new topic"
+            texts = iter([f"Thank you. Let's move on. {next_topic}"])
+        elif planner and planner.bank_turns:
+            # New topics come from the bank, so the LLM only handles follow-ups
+            request = f"Candidate response: {input_text}\n Ask an appropriate follow-up question about this answer"
+        else:
+            request = f"Candidate response: {input_text}\n Ask an appropriate follow-up question or a new question"
+        if next_topic is None:
+            contents = history.contents(request)
+            logger.info("request: %d turns, ~%d tokens", len(contents), history.last_prompt_tokens)
+            try:
+                # The deadline covers the request until the stream is open; gemini_text bounds each chunk
+                response = call_sync(partial(st.session_state.model.generate_content, contents, stream=True), GEMINI_POLICY)
+            except Exception as e:
+                logger.warning("reply failed: %r", e)
+                st.error(f"The interviewer didn't respond ({e}). Please send your answer again.")
+                st.session_state.messages.pop()
+                return
+            texts = gemini_text(response)
+        voice = start_voice()
+        errors = []
+        # Chunks are shown as they arrive; write_stream returns the full text once the stream ends
         with st.chat_message("assistant"):
-            st.write_stream(typewriter(assistant_prompt))
+            audio_area = st.container()
+            on_audio = partial(play_segments, audio_area, uuid.uuid4().hex, errors)
+            assistant_prompt = st.write_stream(stream_reply(texts, start, voice, on_audio))
+            if voice:
+                voice.close()
+                for segment in voice.drain():
+                    on_audio(*segment)
+                errors.extend(voice.wait())
+        if any(isinstance(e, CircuitOpenError) for e in errors):
+            st.info("Voice is unavailable right now, so replies are text-only for a while.")
+        elif errors:
+            st.error(f"Audio generation failed: {str(errors[0])}")
+        logger.info("client reuse: %s", clients.stats())
+        logger.info("tts cache: %s", audio_cache.stats())
+        history.append("user", request)
+        history.append("model", assistant_prompt)
         st.session_state.messages.append(
             {"role": "assistant", "content": assistant_prompt}
         )
@@ -312,18 +489,26 @@ if prompt := st.chat_input("Type your response..."):
 
 if "last_audio_transcript" not in st.session_state:
     st.session_state.last_audio_transcript = None
+if "last_audio_fingerprint" not in st.session_state:
+    st.session_state.last_audio_fingerprint = None
+    st.session_state.skipped_transcriptions = 0
 
 audio_bytes = audio_recorder(pause_threshold=2.0, text="Click to Record", recording_color="#e8b62c", neutral_color="#6aa36f", icon_size="2x")
 
-if audio_bytes:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-        temp_audio.write(audio_bytes)
-        temp_path = temp_audio.name
-
-    time.sleep(0.1)
-    text = stt.transcribe_audio(temp_path)
-    
-    if text and text != st.session_state.last_audio_transcript:
+# The recorder keeps returning its last clip on every rerun; only a new recording is transcribed
+audio_fingerprint = stt.fingerprint(audio_bytes) if audio_bytes else None
+if audio_fingerprint and audio_fingerprint == st.session_state.last_audio_fingerprint:
+    st.session_state.skipped_transcriptions += 1
+    stt.stt_stats["skipped"] += 1
+    logger.debug("skipped re-transcribing the same recording (%d this session)", st.session_state.skipped_transcriptions)
+elif audio_fingerprint:
+    st.session_state.last_audio_fingerprint = audio_fingerprint
+    text = stt.transcribe_audio(audio_bytes)
+    logger.info("stt: %s", dict(stt.stt_stats))
+    if text is None or text == "[API unavailable]":
+        # Let the next rerun try again; segments that did succeed are cached in stt
+        st.session_state.last_audio_fingerprint = None
+    elif text != st.session_state.last_audio_transcript:
         handle_message(text)
         st.session_state.last_audio_transcript = text
 
@@ -1,15 +1,12 @@
-import google.generativeai as genai
 from dotenv import load_dotenv
 import json
 import os
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 from datetime import datetime
 import io
 
+from clients import clients
+from resilient_calls import call_sync, EVALUATION_POLICY
+
 load_dotenv()
 
 
@@ -37,9 +34,8 @@ def generate_evaluation(history_file: str,api_key) -> str:
         for msg in conversation_messages
     )
     
-    # Initialize Gemini
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-1.5-flash')
+    # Shared Gemini model (the SDK is slow to import, so only loaded when first needed)
+    model = clients.gemini_model(api_key)
     
     prompt = f"""
     Analyze this technical interview conversation and provide:
@@ -56,8 +52,7 @@ def generate_evaluation(history_file: str,api_key) -> str:
     {conversation}
     """
     
-    response = model.generate_content(prompt)
-    return response.text
+    return call_sync(lambda: model.generate_content(prompt).text, EVALUATION_POLICY)
 
 # Modified save function that also generates evaluation
 def save_and_evaluate(api_key):
@@ -77,6 +72,11 @@ def save_and_evaluate(api_key):
 
 def generate_pdf_report(history_file: str, api_key, candidate_info=None) -> bytes:
     """Generate a comprehensive PDF report of the interview"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
     
     # Get the evaluation
     evaluation = generate_evaluation(history_file, api_key)
@@ -15,6 +15,7 @@ from jobrole_prediction import predict_job_role
 from resume_parsing import extract_resume_info
 from Interview_evaluation import generate_report_pdf
 import base64
+from conversation_history import ConversationHistory
 
 load_dotenv()
 
@@ -124,6 +125,7 @@ def save_chat_history(history):
 def clear_chat_history():
     """Clear chat history"""
     st.session_state.chat_history = [{"role": "assistant", "content": "Chat history cleared! Click 'Start Interview' to begin a new session."}]
+    st.session_state.pop('history', None)
     save_chat_history(st.session_state.chat_history)
     st.session_state.interview_started = False
 
@@ -171,6 +173,7 @@ def start_interview():
         st.session_state.chat_history = [
             {"role": "assistant", "content": initial_message}
         ]
+        st.session_state.pop('history', None)
         st.session_state.interview_started = True
         save_chat_history(st.session_state.chat_history)
 
@@ -179,24 +182,24 @@ def generate_response(user_input):
     if not GEMINI_API_KEY or not model:
         return "Error: Gemini API not configured"
     
-    # Build conversation context
-    conversation = ""
-    for msg in st.session_state.chat_history[-5:]:  # Last 5 messages for context
-        conversation += f"{msg['role'].upper()}: {msg['content']}\n"
-    conversation += f"USER: {user_input}\n"
+    # Recent turns verbatim, older ones as a rolling summary, within a token budget
+    if 'history' not in st.session_state:
+        st.session_state.history = ConversationHistory(summarizer=lambda request: model.generate_content(request).text)
+    history = st.session_state.history
+    # chat_history already ends with user_input
+    history.extend(st.session_state.chat_history[history.turn_count:-1])
     
     prompt = f"""
-    You are a professional technical interviewer. Continue the interview based on the conversation context.
+    You are a professional technical interviewer. Continue the interview based on the conversation so far.
     
-    Previous conversation:
-    {conversation}
+    Candidate: {user_input}
     
     Provide a professional response that continues the interview. Ask follow-up questions, provide feedback, or ask new technical questions as appropriate.
     Keep responses concise and professional.
     """
     
     try:
-        response = model.generate_content(prompt)
+        response = model.generate_content(history.contents(prompt))
         return response.text
     except Exception as e:
         return f"Error generating response: {e}"
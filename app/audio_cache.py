@@ -0,0 +1,136 @@
+"""On-disk cache of synthesized speech, keyed by sentence text, voice and TTS model.
+
+Interview replies repeat a lot of phrasing ("Thank you. Let's move on."), so
+sentences that were synthesized before play without an ElevenLabs call.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(current_dir, ".cache", "tts"))
+# Set AUDIO_CACHE_MAX_BYTES=0 to disable the cache
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+class AudioCache:
+    """Disk cache of synthesized speech shared by every Streamlit worker process.
+
+    One file per (text, voice, model). Files are written to a temporary name
+    and renamed into place, so readers never see a partial file. A file's
+    mtime is bumped on every hit, and the least recently used files are
+    deleted once the directory grows past max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._bytes = None  # this process's running estimate of the directory size
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _path(self, text, voice_id, model_id):
+        normalized = re.sub(r'\s+', ' ', text).strip()
+        key = hashlib.sha256(json.dumps([normalized, voice_id, model_id]).encode()).hexdigest()
+        # Two-level layout keeps directories small
+        return os.path.join(self.directory, key[:2], key + ".mp3")
+
+    def get(self, text, voice_id, model_id):
+        if not self.enabled:
+            return None
+        path = self._path(text, voice_id, model_id)
+        try:
+            with open(path, 'rb') as f:
+                audio = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # evicted by another process in the meantime; the audio was already read
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(audio)
+        return audio
+
+    def put(self, text, voice_id, model_id, audio):
+        if not self.enabled or not audio:
+            return
+        path = self._path(text, voice_id, model_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)  # e.g. two sessions synthesized the same sentence at once
+        except OSError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._bytes += len(audio) - replaced
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if name.endswith(".tmp"):
+                    # Left behind by a worker that died mid-write
+                    if time.time() - st.st_mtime > 3600:
+                        os.remove(path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self):
+        # Other processes write to the same directory, so eviction works from a fresh scan
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        # Down to 90% so eviction doesn't run again on the very next write
+        for _, size, path in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._bytes = total
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "bytes": self._bytes,
+        }
+
+
+audio_cache = AudioCache(AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES)
@@ -0,0 +1,125 @@
+"""Screen a directory of resumes from the command line.
+
+Every PDF under the input directory is parsed and classified on a process pool,
+and one JSON line per resume is appended to the output file as soon as it
+finishes. Re-running with the same output file skips resumes already done.
+
+    python app/batch_ingest.py resumes/ -o results.jsonl --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import resume_parsing
+import jobrole_prediction
+from resume_document import ResumeDocument
+
+
+def _init_worker():
+    # Load the model once per worker process instead of on the first resume
+    jobrole_prediction.warm_up()
+
+
+def process_resume(root, relpath, top_k=2):
+    """Parse and classify one resume; never raises, errors are reported in the record"""
+    start = time.perf_counter()
+    record = {"file": relpath}
+    try:
+        with open(os.path.join(root, relpath), 'rb') as f:
+            resume = ResumeDocument(f.read())
+        record["info"] = resume_parsing.extract_clean_text(resume)
+        predictions = jobrole_prediction.predict_batch([resume], k=top_k, engine="sparse")[0]
+        record["roles"] = [asdict(p) for p in predictions]
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def find_resumes(root):
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith('.pdf'):
+                paths.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return sorted(paths)
+
+
+def load_done(output_path, retry_errors=False):
+    """Files already recorded in a previous run of the same output file"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            if record.get("status") == "ok" or not retry_errors:
+                done.add(record["file"])
+    return done
+
+
+def run(root, output_path, workers=None, retry_errors=False, top_k=2):
+    paths = find_resumes(root)
+    done = load_done(output_path, retry_errors)
+    todo = [p for p in paths if p not in done]
+    workers = workers or os.cpu_count() or 1
+    print(f"{len(paths)} resumes found, {len(paths) - len(todo)} already done, "
+          f"{len(todo)} to process on {workers} workers", file=sys.stderr)
+
+    ok = errors = 0
+    start = time.perf_counter()
+    with open(output_path, 'a') as out, ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = set()
+        queue = iter(todo)
+        # Keep a bounded number of tasks in flight so huge directories don't pile up futures
+        for relpath in queue:
+            pending.add(pool.submit(process_resume, root, relpath, top_k))
+            if len(pending) < workers * 4:
+                continue
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                ok, errors = _write(out, future.result(), ok, errors, len(todo))
+        for future in wait(pending).done:
+            ok, errors = _write(out, future.result(), ok, errors, len(todo))
+
+    elapsed = time.perf_counter() - start
+    rate = (ok + errors) / elapsed if elapsed else 0.0
+    print(f"Done: {ok} ok, {errors} failed in {elapsed:.1f}s ({rate:.2f} resumes/sec)", file=sys.stderr)
+    return ok, errors
+
+
+def _write(out, record, ok, errors, total):
+    out.write(json.dumps(record) + "\n")
+    out.flush()
+    if record["status"] == "ok":
+        ok += 1
+    else:
+        errors += 1
+    print(f"[{ok + errors}/{total}] {record['status']:<5} {record['file']} ({record['seconds']:.2f}s)",
+          file=sys.stderr)
+    return ok, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse and classify a directory of PDF resumes.")
+    parser.add_argument("input_dir", help="directory searched recursively for .pdf files")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file to append results to")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("-k", "--top-k", type=int, default=2, help="number of ranked roles per resume")
+    parser.add_argument("--retry-errors", action="store_true", help="re-process files that failed in a previous run")
+    args = parser.parse_args(argv)
+    _, errors = run(args.input_dir, args.output, args.workers, args.retry_errors, args.top_k)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Build the offline question bank for every job role, experience level and question type.
+
+Questions are generated with Gemini, a few (role, level, type) keys at a time,
+and written to a new SQLite file. The file replaces the bank in one step once
+every key is done. Re-run after the role list changes.
+
+    python app/build_question_bank.py --per-type 12 --workers 4
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+from clients import clients
+from jobrole_prediction import load_labels
+from question_bank import QUESTION_BANK_PATH, LEVELS, QUESTION_TYPES, create_bank, store_questions
+from resilient_calls import CallPolicy, call_sync
+
+BUILD_POLICY = CallPolicy(deadline=120.0, attempts=4, max_delay=10.0)
+
+PROMPT = """Write {n} distinct {qtype} interview questions for a {level} {role} candidate.
+Each question must stand on its own as the start of a new topic, without referring to earlier answers.
+Return only a JSON array of strings."""
+
+
+def parse_questions(text):
+    """JSON array from the reply, tolerating code fences; falls back to one question per line"""
+    text = re.sub(r'^```(?:json)?|```$', '', text.strip(), flags=re.MULTILINE).strip()
+    try:
+        questions = json.loads(text)
+    except json.JSONDecodeError:
+        questions = [re.sub(r'^\s*(?:[-*]|\d+[.)])\s*', '', line) for line in text.splitlines()]
+    return [q.strip() for q in questions if isinstance(q, str) and q.strip().endswith("?")]
+
+
+def generate(model, role, level, qtype, n):
+    reply = call_sync(lambda: model.generate_content(PROMPT.format(n=n, qtype=qtype, level=level, role=role)).text,
+                      BUILD_POLICY)
+    return parse_questions(reply)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the interview question bank with Gemini.")
+    parser.add_argument("-o", "--output", default=QUESTION_BANK_PATH)
+    parser.add_argument("-n", "--per-type", type=int, default=12, help="questions per role, level and type")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="concurrent Gemini requests")
+    parser.add_argument("--roles", nargs="*", help="only these roles (default: every role the model predicts)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    model = clients.gemini_model(os.getenv("GEMINI_API_KEY"),
+                                 system_instruction="You write interview questions for technical hiring.")
+    roles = args.roles or load_labels()
+    keys = [(role, level, qtype) for role in roles for level in LEVELS for qtype in QUESTION_TYPES]
+
+    tmp = args.output + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = create_bank(tmp)
+    failed = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(generate, model, *key, args.per_type): key for key in keys}
+        for done, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            try:
+                questions = future.result()
+            except Exception as e:
+                questions = []
+                print(f"failed {key}: {e}", file=sys.stderr)
+            if questions:
+                store_questions(conn, *key, questions)
+            else:
+                failed += 1
+            print(f"[{done}/{len(keys)}] {' / '.join(key)}: {len(questions)} questions", file=sys.stderr)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    os.replace(tmp, args.output)
+    print(f"bank written to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KiB) in "
+          f"{time.perf_counter() - start:.0f}s; {failed} keys failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Process-wide Gemini and ElevenLabs clients.
+
+Streamlit reruns the script for every interaction and every session, so
+clients built inside the script pay for a new TLS handshake each time. The
+registry here builds them once per process and is safe to share between
+sessions and worker threads:
+
+  - Gemini is configured once per API key. Models are cached per system
+    instruction, and every model reuses the SDK's single transport.
+  - ElevenLabs clients share one pooled keep-alive httpx.Client. Its transport
+    counts how many requests needed a new connection, so reuse can be checked
+    with clients.stats().
+"""
+import os
+import threading
+from collections import OrderedDict
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", 60))
+# System instructions embed the candidate profile, so the model cache is bounded
+MAX_CACHED_MODELS = 64
+
+
+class ConnectionStats:
+    """Counts HTTP requests and how many of them had to open a new connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record(self, opened_connection):
+        with self._lock:
+            self.requests += 1
+            self.new_connections += int(opened_connection)
+
+    def snapshot(self):
+        with self._lock:
+            requests, new = self.requests, self.new_connections
+        return {
+            "requests": requests,
+            "new_connections": new,
+            "reused_connections": requests - new,
+            "reuse_ratio": (requests - new) / requests if requests else 0.0,
+        }
+
+
+def _counting_transport(stats, limits):
+    # httpx is only imported with the ElevenLabs SDK, so the transport class is built on first use
+    import httpx
+
+    class CountingTransport(httpx.HTTPTransport):
+        def handle_request(self, request):
+            opened = []
+            outer = request.extensions.get("trace")
+
+            # httpcore reports connection events through the "trace" request extension
+            def trace(event, info):
+                if event == "connection.connect_tcp.complete":
+                    opened.append(True)
+                if outer is not None:
+                    outer(event, info)
+
+            request.extensions = {**request.extensions, "trace": trace}
+            try:
+                return super().handle_request(request)
+            finally:
+                stats.record(bool(opened))
+
+    return CountingTransport(limits=limits)
+
+
+class ClientRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gemini_key = None
+        self._models = OrderedDict()
+        self._elevenlabs = {}
+        self._http = None
+        self.http_stats = ConnectionStats()
+        self.model_hits = 0
+        self.model_misses = 0
+
+    def gemini_model(self, api_key, system_instruction=None, model_name=None):
+        """A GenerativeModel for this system instruction, built once and reused"""
+        model_name = model_name or GEMINI_MODEL
+        key = (api_key, model_name, system_instruction)
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.model_hits += 1
+                return model
+            import google.generativeai as genai
+            # configure() replaces the SDK's process-global client, so it only runs when the key changes
+            if self._gemini_key != api_key:
+                genai.configure(api_key=api_key)
+                self._gemini_key = api_key
+            model = genai.GenerativeModel(model_name=model_name, system_instruction=system_instruction)
+            self._models[key] = model
+            self.model_misses += 1
+            while len(self._models) > MAX_CACHED_MODELS:
+                self._models.popitem(last=False)
+            return model
+
+    def http_client(self):
+        """The shared keep-alive httpx.Client"""
+        with self._lock:
+            if self._http is None:
+                import httpx
+                limits = httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+                )
+                self._http = httpx.Client(
+                    transport=_counting_transport(self.http_stats, limits),
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                )
+            return self._http
+
+    def elevenlabs(self, api_key):
+        """An ElevenLabs client per API key, all on the shared connection pool"""
+        http = self.http_client()
+        with self._lock:
+            client = self._elevenlabs.get(api_key)
+            if client is None:
+                from elevenlabs import ElevenLabs
+                client = self._elevenlabs[api_key] = ElevenLabs(api_key=api_key, httpx_client=http)
+            return client
+
+    def stats(self):
+        lookups = self.model_hits + self.model_misses
+        return {
+            **self.http_stats.snapshot(),
+            "gemini_models": len(self._models),
+            "gemini_model_hit_ratio": self.model_hits / lookups if lookups else 0.0,
+        }
+
+
+clients = ClientRegistry()
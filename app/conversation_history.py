@@ -0,0 +1,190 @@
+"""Token-budgeted interview history for Gemini requests.
+
+Recent turns are sent verbatim. Once the history grows past a share of the
+budget, the older turns are folded into a rolling summary by a background
+Gemini call, so every request stays under HISTORY_TOKEN_BUDGET however long
+the interview runs. Tokens are estimated locally; no API call is spent on
+counting.
+"""
+import logging
+import math
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", 3000))
+# Turns at the end of the history that are never summarized
+HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", 6))
+# Share of the budget the history may fill before older turns are summarized
+SUMMARIZE_AT = 0.6
+
+SUMMARY_PROMPT = """Summarise this job interview for the interviewer's own notes, in under 150 words.
+Keep the topics and questions already covered, the candidate's key answers, strengths and weaknesses.
+
+Summary so far:
+{summary}
+
+New turns:
+{turns}"""
+
+logger = logging.getLogger("interview")
+
+_PIECES = re.compile(r'\w+|[^\w\s]')
+
+_SUMMARY_HEADER = "Summary of the interview so far:\n"
+_OPENING_FILLER = "Continue the interview."
+_CLIP_MARK = "..."
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _summary_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summary")
+        return _executor
+
+
+def count_tokens(text):
+    """Local estimate of Gemini tokens: one per punctuation mark, about four characters per word piece"""
+    return sum(math.ceil(len(piece) / 4) for piece in _PIECES.findall(text))
+
+
+_CLIP_MARK_TOKENS = count_tokens(_CLIP_MARK)
+
+
+@dataclass(frozen=True)
+class Turn:
+    role: str  # "user" or "model"
+    text: str
+    tokens: int
+
+
+class ConversationHistory:
+    """Interview turns plus a rolling summary of the turns that no longer fit the budget.
+
+    summarizer(prompt) -> str is the call that writes summaries; it runs on a
+    background thread. Without one, turns that don't fit are clipped or left out
+    of the request, with a warning in the log.
+    """
+
+    def __init__(self, summarizer=None, budget=None, keep_turns=None, executor=None):
+        self.summarizer = summarizer
+        self.budget = budget or HISTORY_TOKEN_BUDGET
+        self.keep_turns = HISTORY_KEEP_TURNS if keep_turns is None else keep_turns
+        self._executor = executor
+        self._turns = []
+        self._summarized = 0  # turns before this index are covered by the summary
+        self._pending = None  # (future, index the summary will cover up to)
+        self.summary = ""
+        self._summary_tokens = 0
+        self.last_prompt_tokens = 0
+
+    def append(self, role, text):
+        role = "model" if role in ("model", "assistant") else "user"
+        self._turns.append(Turn(role, text, count_tokens(text)))
+
+    def extend(self, messages):
+        """Append {"role", "content"} chat messages"""
+        for message in messages:
+            self.append(message["role"], str(message["content"]))
+
+    @property
+    def turn_count(self):
+        return len(self._turns)
+
+    def contents(self, new_text):
+        """Gemini contents for the next request: summary, recent turns and new_text, within the budget"""
+        self._collect_summary()
+        self._maybe_summarize()
+        summary = f"{_SUMMARY_HEADER}{self.summary}" if self.summary else None
+        # Everything sent besides the turns counts against the budget too. Without a summary the
+        # window may open with a model turn, which needs the filler turn _as_contents adds.
+        remaining = self.budget - count_tokens(new_text) - count_tokens(summary or _OPENING_FILLER)
+        window = []
+        unsummarized = self._turns[self._summarized:]
+        for position, turn in enumerate(reversed(unsummarized)):
+            if turn.tokens > remaining:
+                # The summary is behind: it is still being written, or it failed and is retried on
+                # the next request. The turn that doesn't fit is cut to the budget and the older
+                # ones are left out of this request only; they stay in the history.
+                clipped = _clip(turn, remaining)
+                if clipped is not None:
+                    remaining -= clipped.tokens
+                    window.append(clipped)
+                left_out = len(unsummarized) - position - (clipped is not None)
+                logger.warning("history over budget: %s, %d older turn(s) left out of this request",
+                               "summary pending" if self._pending else "summary behind", left_out)
+                break
+            remaining -= turn.tokens
+            window.append(turn)
+        window.reverse()
+
+        items = []
+        if summary:
+            items.append(("user", summary))
+        items.extend((turn.role, turn.text) for turn in window)
+        items.append(("user", new_text))
+        contents = _as_contents(items)
+        # Measured on what is actually sent
+        self.last_prompt_tokens = sum(count_tokens(part) for content in contents for part in content["parts"])
+        return contents
+
+    def _maybe_summarize(self):
+        if self.summarizer is None or self._pending is not None:
+            return
+        unsummarized = self._turns[self._summarized:]
+        if len(unsummarized) <= self.keep_turns:
+            return
+        if sum(t.tokens for t in unsummarized) + self._summary_tokens < self.budget * SUMMARIZE_AT:
+            return
+        folded = unsummarized[:len(unsummarized) - self.keep_turns]
+        prompt = SUMMARY_PROMPT.format(
+            summary=self.summary or "(none yet)",
+            turns="\n".join(f"{'INTERVIEWER' if t.role == 'model' else 'CANDIDATE'}: {t.text}" for t in folded),
+        )
+        executor = self._executor or _summary_executor()
+        self._pending = (executor.submit(self.summarizer, prompt), self._summarized + len(folded))
+
+    def _collect_summary(self):
+        if self._pending is None or not self._pending[0].done():
+            return
+        future, covered = self._pending
+        self._pending = None
+        try:
+            summary = future.result().strip()
+        except Exception as e:
+            logger.warning("history summary failed: %s", e)  # retried on the next request
+            return
+        self.summary = summary
+        self._summary_tokens = count_tokens(summary)
+        self._summarized = covered
+
+
+def _clip(turn, tokens, min_tokens=20):
+    """turn with only the end of its text, at most tokens long; None if too little room is left"""
+    if tokens < min_tokens:
+        return None
+    text = turn.text[-tokens * 4:]
+    while count_tokens(text) > tokens - _CLIP_MARK_TOKENS:
+        text = text[len(text) // 10 + 1:]
+    text = _CLIP_MARK + text
+    return Turn(turn.role, text, count_tokens(text))
+
+
+def _as_contents(items):
+    # Gemini expects the conversation to open with a user turn; consecutive turns
+    # of the same role are merged into one content with several parts
+    if items and items[0][0] != "user":
+        items.insert(0, ("user", _OPENING_FILLER))
+    contents = []
+    for role, text in items:
+        if contents and contents[-1]["role"] == role:
+            contents[-1]["parts"].append(text)
+        else:
+            contents.append({"role": role, "parts": [text]})
+    return contents
@@ -1,23 +1,43 @@
 # jobrole_prediction.py
 
-import nltk
 import re
+import json
 import pickle
-import fitz  # PyMuPDF
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from resume_document import as_document
+from result_cache import cache, make_key, file_version
 
-# Download NLTK data (can be skipped after first run)
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('wordnet')
+# NLTK data needed for preprocessing. It is never downloaded at import time:
+# run `python app/setup_nltk.py` once per environment.
+NLTK_RESOURCES = {"stopwords": "corpora/stopwords", "wordnet": "corpora/wordnet"}
 
-# Initialize
-stop_words = set(stopwords.words('english'))
-lemmatizer = WordNetLemmatizer()
+def download_nltk_data():
+    import nltk
+    for name in NLTK_RESOURCES:
+        nltk.download(name)
 
-# Job label list
+@lru_cache(maxsize=1)
+def nltk_resources():
+    """Stop words and lemmatizer, loaded from local NLTK data on first use"""
+    # NLTK itself takes seconds to import, so it is only imported when needed
+    import nltk
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(name)
+    if missing:
+        raise LookupError(
+            f"NLTK data not found: {', '.join(missing)}. Run `python app/setup_nltk.py` to download it."
+        )
+    return set(stopwords.words('english')), WordNetLemmatizer()
+
+# Job label list, used when the model has no labels.json written by train_model.py
 y_list = [
     'Accountant', 'Advocate', 'Agriculture', 'Apparel', 'Architecture',
     'Arts', 'Automobile', 'Aviation', 'Banking', 'Blockchain', 'BPO',
@@ -38,45 +58,224 @@ import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(current_dir, "model.pkl")
 VEC_PATH = os.path.join(current_dir, "tfidf_vectorizer.pkl")
+LABELS_PATH = os.path.join(current_dir, "labels.json")
+
+# Number of role scores kept per resume (and stored in the result cache)
+TOP_K = 5
+
+# Words NLTK's word_tokenize splits even in text without punctuation, e.g. "cannot" -> "can not"
+_TOKEN_SPLITS = {
+    "cannot": ["can", "not"], "gimme": ["gim", "me"], "gonna": ["gon", "na"],
+    "gotta": ["got", "ta"], "lemme": ["lem", "me"], "wanna": ["wan", "na"],
+}
+LEMMA_CACHE_SIZE = 100_000
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def _lemmatize(word):
+    return nltk_resources()[1].lemmatize(word)
 
-def preprocess_text(text):
+def tokenize(text):
+    """Same tokens as word_tokenize for text already reduced to lowercase letters and spaces"""
+    for token in text.split():
+        split = _TOKEN_SPLITS.get(token)
+        if split:
+            yield from split
+        else:
+            yield token
+
+def build_lemma_sources(vocabulary):
+    """Every word whose (noun) lemma could be one of the vocabulary terms"""
+    nltk_resources()
+    from nltk.corpus import wordnet
+    sources = set(vocabulary)
+    # Invert WordNet's suffix rules, e.g. "skill" <- "skills", "policy" <- "policies"
+    for term in vocabulary:
+        for old, new in wordnet.MORPHOLOGICAL_SUBSTITUTIONS['n']:
+            if term.endswith(new):
+                sources.add(term[:len(term) - len(new)] + old)
+    # Irregular plurals, e.g. "analysis" <- "analyses"
+    wordnet.ensure_loaded()
+    for form, lemmas in wordnet._exception_map['n'].items():
+        if any(lemma in vocabulary for lemma in lemmas):
+            sources.add(form)
+    return frozenset(sources)
+
+def preprocess_text(text, lemma_sources=None):
+    stop_words, _ = nltk_resources()
     text = re.sub(r'[^a-zA-Z ]', ' ', text).lower()
-    tokens = word_tokenize(text)
-    tokens = [lemmatizer.lemmatize(word) for word in tokens if word not in stop_words]
+    tokens = [word for word in tokenize(text) if word not in stop_words]
+    if lemma_sources is None:
+        tokens = [_lemmatize(word) for word in tokens]
+    else:
+        # The vectorizer drops a word whose lemma is not in its vocabulary, lemmatized or not
+        tokens = [_lemmatize(word) if word in lemma_sources else word for word in tokens]
     return ' '.join(tokens)
 
+def preprocess_for_model(text):
+    """preprocess_text, skipping lemmatization for words the loaded vectorizer ignores anyway"""
+    return preprocess_text(text, model_holder.lemma_sources())
+
 def load_model_and_vectorizer():
     with open(MODEL_PATH, 'rb') as f_model, open(VEC_PATH, 'rb') as f_vec:
         model = pickle.load(f_model)
         vectorizer = pickle.load(f_vec)
     return model, vectorizer
 
+def load_labels():
+    """Class labels in decision_function column order"""
+    if os.path.exists(LABELS_PATH):
+        with open(LABELS_PATH, 'r') as f:
+            return json.load(f)
+    return y_list
+
+def _model_files():
+    return [MODEL_PATH, VEC_PATH] + ([LABELS_PATH] if os.path.exists(LABELS_PATH) else [])
+
+class ModelHolder:
+    """Process-wide model, vectorizer and labels, loaded on first use and reloaded when the files change"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (stamp, (model, vectorizer, labels)), replaced in one assignment so readers
+        # never pair a new model with old labels or the reverse
+        self._state = None
+        self._lemma_sources = None
+        self._scorer = None
+        self.loads = 0
+
+    def _file_stamp(self):
+        stats = [os.stat(path) for path in _model_files()]
+        return tuple((st.st_mtime_ns, st.st_size) for st in stats)
+
+    def get(self):
+        """(model, vectorizer, labels) from one consistent load"""
+        stamp = self._file_stamp()
+        state = self._state
+        if state is not None and state[0] == stamp:
+            return state[1]
+        with self._lock:
+            # Another thread may have loaded it while we waited for the lock
+            if self._state is None or self._state[0] != stamp:
+                model, vectorizer = load_model_and_vectorizer()
+                self._state = (stamp, (model, vectorizer, load_labels()))
+                self.loads += 1
+            return self._state[1]
+
+    def lemma_sources(self):
+        _, vectorizer, _ = self.get()
+        # Rebuilt only when a reload brought in a new vectorizer
+        if self._lemma_sources is None or self._lemma_sources[0] is not vectorizer:
+            # Hashing vectorizers (streaming training) have no vocabulary to skip against
+            vocabulary = getattr(vectorizer, "vocabulary_", None)
+            sources = build_lemma_sources(vocabulary) if vocabulary is not None else None
+            self._lemma_sources = (vectorizer, sources)
+        return self._lemma_sources[1]
+
+    def scorer(self):
+        """LinearScorer for the loaded model, or None if its vectorizer is not supported"""
+        model, vectorizer, labels = self.get()
+        if self._scorer is None or self._scorer[0] is not vectorizer:
+            from linear_scorer import LinearScorer
+            try:
+                scorer = LinearScorer(model, vectorizer, labels)
+            except ValueError:
+                scorer = None
+            self._scorer = (vectorizer, scorer)
+        return self._scorer[1]
+
+model_holder = ModelHolder()
+_warmed_up = False
+
+def get_model_and_vectorizer():
+    model, vectorizer, _ = model_holder.get()
+    return model, vectorizer
+
+def warm_up():
+    """Load the model and lemmatizer data up front so the first prediction is fast"""
+    global _warmed_up
+    model, vectorizer = get_model_and_vectorizer()
+    if not _warmed_up:
+        # WordNet is only loaded on the first lemmatize call
+        model.decision_function(vectorizer.transform([preprocess_for_model("warm up resumes")]))
+        _warmed_up = True
+
 def extract_text_from_pdf(file_bytes):
-    doc = fitz.open(stream=file_bytes, filetype="pdf")
-    text = "\n".join([page.get_text() for page in doc])
-    return text
+    return as_document(file_bytes).raw_text
+
+def model_version():
+    # Re-hashed only when the model files change on disk
+    files = tuple(_model_files())
+    return _model_version(files, tuple(os.path.getmtime(path) for path in files))
+
+@lru_cache(maxsize=1)
+def _model_version(files, mtimes):
+    return file_version(*files)
+
+@dataclass(frozen=True)
+class RolePrediction:
+    role: str
+    score: float  # LinearSVC decision function value
+    rank: int     # 1 is the best match
+
+def _as_predictions(pairs, k):
+    return [RolePrediction(role, score, rank) for rank, (role, score) in enumerate(pairs[:k], start=1)]
+
+def predict_batch(texts_or_pdfs, k=2, engine="sklearn"):
+    """Classify resumes given as raw text, PDF bytes or ResumeDocuments.
+
+    With the default engine, uncached documents go through a single
+    vectorizer.transform and a single decision_function call. engine="sparse"
+    scores each document directly with LinearScorer, which is faster for
+    high-volume screening. Returns one list of k RolePredictions per input.
+    """
+    results = [None] * len(texts_or_pdfs)
+    todo = []  # (position, preprocessed text, cache key or None)
+    for i, item in enumerate(texts_or_pdfs):
+        if isinstance(item, str):
+            todo.append((i, preprocess_for_model(item), None))
+            continue
+        doc = as_document(item)
+        # Role scores for PDFs are cached by file content, extraction limits and model version
+        key = make_key("roles", doc.sha256, f"{doc.extraction_version}.{model_version()}")
+        cached = cache.get(key)
+        if cached is not None and len(cached) >= k:
+            results[i] = _as_predictions(cached, k)
+        else:
+            cleaned = doc.lemmatized_text
+            # Scores for a truncated parse are returned but not cached
+            todo.append((i, cleaned, None if doc.truncated else key))
+
+    if not todo:
+        return results
+    keep = max(k, TOP_K)
+    scorer = model_holder.scorer() if engine == "sparse" else None
+    if scorer is not None:
+        all_pairs = [scorer.top_k(cleaned.split(), keep) for _, cleaned, _ in todo]
+    else:
+        import numpy as np
+        model, vectorizer, labels = model_holder.get()
+        X_new = vectorizer.transform([cleaned for _, cleaned, _ in todo])
+        decision_scores = model.decision_function(X_new)
+        top_indices = np.argsort(-decision_scores, axis=1)[:, :keep]
+        all_pairs = [[(labels[j], float(scores[j])) for j in indices]
+                     for scores, indices in zip(decision_scores, top_indices)]
+    for (i, _, key), pairs in zip(todo, all_pairs):
+        if key is not None:
+            cache.put(key, pairs)
+        results[i] = _as_predictions(pairs, k)
+    return results
+
+def format_prediction(predictions):
+    """Render the markdown sentence shown to the candidate"""
+    result = f"Based on your resume, you are best suited for **{predictions[0].role}** position."
+    if len(predictions) > 1:
+        others = ", ".join(f"**{p.role}**" for p in predictions[1:])
+        result += f" Other possible roles include {others}."
+    return result
 
 def predict(file_bytes):
+    # Accepts raw PDF bytes or a ResumeDocument shared with resume_parsing
     try:
-        text = extract_text_from_pdf(file_bytes)
-        cleaned = preprocess_text(text)
-        model, vectorizer = load_model_and_vectorizer()
-        X_new = vectorizer.transform([cleaned])
-        
-        # Get decision function scores for all classes
-        decision_scores = model.decision_function(X_new)[0]
-        
-        # Get top 2 predictions based on decision scores
-        top_indices = decision_scores.argsort()[-2:][::-1]  # Get indices of top 2
-        top_jobs = [y_list[i] for i in top_indices]
-        top_scores = [decision_scores[i] for i in top_indices]
-        
-        # Format the result as a proper sentence
-        best_match = top_jobs[0]
-        second_best = top_jobs[1]
-        
-        result = f"Based on your resume, you are best suited for **{best_match}** position. Other possible roles include **{second_best}**."
-        
-        return result
+        return format_prediction(predict_batch([file_bytes])[0])
     except Exception as e:
         return f"Prediction failed: {e}"
@@ -0,0 +1,94 @@
+import math
+import threading
+from collections import Counter
+from itertools import repeat
+
+import numpy as np
+
+
+class LinearScorer:
+    """Scores preprocessed resume tokens against a linear classifier without going through sklearn.
+
+    Tokens are mapped straight to vocabulary indices and the decision function
+    coef_ @ x + intercept_ is computed from the document's non-zero TF-IDF
+    entries only. Apart from the token counts and one small index/value array
+    per document, scratch buffers are allocated once per thread and reused.
+    """
+
+    def __init__(self, model, vectorizer, labels):
+        if not hasattr(vectorizer, "vocabulary_") or not hasattr(vectorizer, "idf_"):
+            raise ValueError("LinearScorer needs a fitted TfidfVectorizer")
+        params = vectorizer.get_params()
+        # Only the plain word-unigram setup used by the notebook is supported
+        if (params["analyzer"] != "word" or params["ngram_range"] != (1, 1) or params["binary"]
+                or params["tokenizer"] is not None or params["preprocessor"] is not None
+                or params["stop_words"] is not None or params["norm"] not in ("l2", "l1", None)):
+            raise ValueError("LinearScorer only supports word unigram TF-IDF vectorizers")
+        self.labels = labels
+        self.vocabulary = vectorizer.vocabulary_
+        n_features = len(self.vocabulary)
+        n_classes = model.coef_.shape[0]
+        dtype = model.coef_.dtype
+        # Out-of-vocabulary tokens map to an extra index whose idf and weights are zero,
+        # so every lookup stays in C and needs no filtering afterwards
+        self._oov = n_features
+        self.idf = np.zeros(n_features + 1, dtype=dtype)
+        self.idf[:n_features] = vectorizer.idf_ if params["use_idf"] else 1.0
+        self.sublinear_tf = params["sublinear_tf"]
+        self.norm = params["norm"]
+        # One row of class weights per term, so a document only touches its own rows
+        self.weights = np.zeros((n_features + 1, n_classes), dtype=dtype)
+        self.weights[:n_features] = model.coef_.T
+        self.intercept = np.asarray(model.intercept_, dtype=dtype)
+        self._local = threading.local()
+
+    def _buffers(self):
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            n_rows, n_classes = self.weights.shape
+            buffers = self._local.buffers = (
+                np.empty(n_rows, dtype=self.weights.dtype),               # idf of the document's terms
+                np.empty((n_rows, n_classes), dtype=self.weights.dtype),  # their weight rows
+                np.empty(n_classes, dtype=self.weights.dtype),            # decision scores
+            )
+        return buffers
+
+    def decision_scores(self, tokens):
+        """Decision function for one document given as preprocessed tokens.
+
+        The returned array is a scratch buffer overwritten by the next call on this thread.
+        """
+        idf_buf, rows_buf, scores = self._buffers()
+        counts = Counter(tokens)
+        n = len(counts)
+        if n == 0:
+            scores[:] = self.intercept
+            return scores
+        # The document's index and value buffers: one entry per distinct token
+        indices = np.fromiter(map(self.vocabulary.get, counts.keys(), repeat(self._oov, n)),
+                              dtype=np.intp, count=n)
+        values = np.fromiter(counts.values(), dtype=self.weights.dtype, count=n)
+        if self.sublinear_tf:
+            np.log(values, out=values)
+            values += 1
+        values *= self.idf.take(indices, out=idf_buf[:n])
+        if self.norm == "l2":
+            norm = math.sqrt(np.dot(values, values))
+        elif self.norm == "l1":
+            norm = values.sum()
+        else:
+            norm = 0.0
+        if norm:
+            values /= norm
+        rows = self.weights.take(indices, axis=0, out=rows_buf[:n])
+        np.dot(values, rows, out=scores)
+        scores += self.intercept
+        return scores
+
+    def top_k(self, tokens, k=2):
+        """Return the k best (label, score) pairs, best first"""
+        scores = self.decision_scores(tokens)
+        k = min(k, len(scores))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(self.labels[i], float(scores[i])) for i in top]
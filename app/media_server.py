@@ -0,0 +1,175 @@
+"""Local HTTP endpoint that streams synthesized speech to the browser.
+
+Audio used to reach the page as a base64 data URL inside the Streamlit
+markdown, so every clip went through the websocket a third larger and stayed
+in the page. Now each sentence gets a short-lived MediaStream and the page
+only receives its URL. TTS chunks are written to the stream as they arrive,
+and the browser fetches them over plain HTTP, so playback can start before
+synthesis of the sentence has finished.
+
+Streams are kept after they finish so the browser can re-request them (media
+elements sometimes do). A session's streams are limited to
+MEDIA_SESSION_BYTES and every stream expires after MEDIA_TTL seconds.
+
+The browser has to reach the endpoint itself, so streaming is only on by
+default when MEDIA_PUBLIC_URL (e.g. an HTTPS path proxied to this server)
+or a fixed MEDIA_PORT is configured; otherwise audio stays inline. A stream
+URL carries the session's secret and the stream's own random token, and both
+must match.
+"""
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MEDIA_HOST = os.getenv("MEDIA_HOST", "127.0.0.1")
+MEDIA_PORT = int(os.getenv("MEDIA_PORT", 0))  # 0 picks a free port, only reachable from this machine
+MEDIA_PUBLIC_URL = os.getenv("MEDIA_PUBLIC_URL")
+# Audio is sent inline as data URLs unless the endpoint has an address browsers can use
+MEDIA_STREAMING = os.getenv("MEDIA_STREAMING", "1" if MEDIA_PUBLIC_URL or MEDIA_PORT else "0") != "0"
+MEDIA_SESSION_BYTES = int(os.getenv("MEDIA_SESSION_BYTES", 4 * 1024 * 1024))
+MEDIA_TTL = float(os.getenv("MEDIA_TTL", 300))
+# How long a reader waits for the next chunk before giving up on a stalled stream
+STALL_TIMEOUT = 30.0
+
+logger = logging.getLogger("interview")
+
+
+class StreamClosed(Exception):
+    pass
+
+
+class MediaStream:
+    """Append-only chunk buffer for one audio clip; any number of readers can follow it"""
+
+    def __init__(self, token, session_id, url):
+        self.token = token
+        self.session_id = session_id
+        self.url = url
+        self.created = time.monotonic()
+        self.size = 0
+        self.closed = False
+        self._chunks = []
+        self._cond = threading.Condition()
+
+    def write(self, data):
+        with self._cond:
+            if self.closed:
+                raise StreamClosed(self.token)
+            self._chunks.append(data)
+            self.size += len(data)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def read_from(self, index, timeout=STALL_TIMEOUT):
+        """Chunks from position index on, waiting for more; an empty list means the stream is over"""
+        with self._cond:
+            self._cond.wait_for(lambda: index < len(self._chunks) or self.closed, timeout)
+            return self._chunks[index:]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Close-delimited responses: the length isn't known while the audio is still being synthesized
+    protocol_version = "HTTP/1.0"
+    media = None  # set on the per-server subclass
+
+    def do_GET(self):
+        match = re.fullmatch(r'/audio/([A-Za-z0-9_-]+)/([A-Za-z0-9_-]+)\.mp3', self.path.split('?')[0])
+        stream = self.media.get(match.group(2)) if match else None
+        # A token alone isn't enough; the URL must also carry the owning session's secret
+        if stream is None or not secrets.compare_digest(stream.session_id, match.group(1)):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        index = 0
+        try:
+            while True:
+                chunks = stream.read_from(index)
+                if not chunks:
+                    break
+                for chunk in chunks:
+                    self.wfile.write(chunk)
+                self.wfile.flush()
+                index += len(chunks)
+                self.media.bytes_served += sum(map(len, chunks))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the page moved on before the clip finished
+
+    def log_message(self, *args):
+        pass
+
+
+class MediaServer:
+    def __init__(self, host, port, public_url=None, session_bytes=MEDIA_SESSION_BYTES, ttl=MEDIA_TTL):
+        self.host = host
+        self.port = port
+        self.public_url = public_url
+        self.session_bytes = session_bytes
+        self.ttl = ttl
+        self.bytes_served = 0
+        self._streams = OrderedDict()  # token -> MediaStream, oldest first
+        self._lock = threading.Lock()
+        self._server = None
+        self.base_url = None
+
+    def start(self):
+        """Start serving in a daemon thread (once per process); returns self"""
+        with self._lock:
+            if self._server is None:
+                handler = type("MediaHandler", (_Handler,), {"media": self})
+                self._server = ThreadingHTTPServer((self.host, self.port), handler)
+                self._server.daemon_threads = True
+                threading.Thread(target=self._server.serve_forever, name="media", daemon=True).start()
+                host = "localhost" if self.host in ("0.0.0.0", "127.0.0.1") else self.host
+                self.base_url = (self.public_url or f"http://{host}:{self._server.server_port}").rstrip("/")
+                logger.info("media endpoint at %s", self.base_url)
+        return self
+
+    def open_stream(self, session_id):
+        """A new stream for session_id, which should be an unguessable per-session secret"""
+        token = secrets.token_urlsafe(16)
+        stream = MediaStream(token, session_id, f"{self.base_url}/audio/{session_id}/{token}.mp3")
+        with self._lock:
+            self._expire()
+            self._streams[token] = stream
+        return stream
+
+    def get(self, token):
+        with self._lock:
+            return self._streams.get(token)
+
+    def _expire(self):
+        now = time.monotonic()
+        per_session = {}
+        for stream in self._streams.values():
+            per_session[stream.session_id] = per_session.get(stream.session_id, 0) + stream.size
+        for token, stream in list(self._streams.items()):
+            too_old = now - stream.created > self.ttl
+            # Over budget: finished clips go first, oldest first; clips still being written are kept
+            over_budget = stream.closed and per_session[stream.session_id] > self.session_bytes
+            if too_old or over_budget:
+                stream.close()
+                del self._streams[token]
+                per_session[stream.session_id] -= stream.size
+
+    def stats(self):
+        with self._lock:
+            return {
+                "streams": len(self._streams),
+                "buffered_bytes": sum(s.size for s in self._streams.values()),
+                "bytes_served": self.bytes_served,
+            }
+
+
+media_server = MediaServer(MEDIA_HOST, MEDIA_PORT, MEDIA_PUBLIC_URL)
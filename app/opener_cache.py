@@ -0,0 +1,92 @@
+"""In-process cache of interview opening turns.
+
+Openers are keyed by the normalized (role, experience level, skill set) and
+each key collects several variants so candidates with the same profile don't
+all get the same first question. A key only serves from the cache once it
+holds OPENER_VARIANTS fresh variants; until then every session generates a
+new one. Variants expire after a TTL and the least recently used keys are
+evicted beyond OPENER_CACHE_SIZE.
+"""
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+
+OPENER_CACHE_SIZE = int(os.getenv("OPENER_CACHE_SIZE", 256))
+OPENER_CACHE_TTL = float(os.getenv("OPENER_CACHE_TTL", 24 * 3600))
+OPENER_VARIANTS = int(os.getenv("OPENER_VARIANTS", 3))
+
+
+def _normalize(value):
+    return re.sub(r'\s+', ' ', str(value)).strip().lower()
+
+
+def opener_key(role, level, skills=()):
+    """Cache key that ignores case, spacing, duplicates and skill order"""
+    return (_normalize(role), _normalize(level), tuple(sorted({_normalize(s) for s in skills or ()} - {""})))
+
+
+class OpenerCache:
+    """Thread-safe TTL + LRU cache holding several opener variants per key"""
+
+    def __init__(self, max_keys, ttl, variants, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.variants = variants
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> [(created, text), ...]
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry[:] = [(created, text) for created, text in entry if now - created < self.ttl]
+        if not entry:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key):
+        """A cached opener for the key, or None when a new variant should be generated"""
+        with self._lock:
+            entry = self._fresh(key, self._clock())
+            if entry is None or len(entry) < self.variants:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._rng.choice(entry)[1]
+
+    def put(self, key, text):
+        with self._lock:
+            now = self._clock()
+            entry = self._fresh(key, now)
+            if entry is None:
+                entry = self._entries[key] = []
+            if text not in (t for _, t in entry):
+                entry.append((now, text))
+                # Keep the newest variants if a key ever collects more than needed
+                del entry[:-self.variants]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+opener_cache = OpenerCache(OPENER_CACHE_SIZE, OPENER_CACHE_TTL, OPENER_VARIANTS)
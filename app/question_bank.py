@@ -0,0 +1,128 @@
+"""Precomputed interview questions per (role, experience level, question type).
+
+The bank is a small SQLite file built offline by build_question_bank.py. Each
+(role, level, type) row holds its questions as zlib-compressed JSON. The file
+is opened on first use and each row is decompressed once. Roles typed in by
+hand that aren't in the bank simply miss, and the LLM is used as before.
+"""
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import zlib
+from functools import lru_cache
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", os.path.join(current_dir, "question_bank.sqlite"))
+
+LEVELS = ("Entry-Level", "Mid-Level", "Senior-Level")
+QUESTION_TYPES = ("technical", "behavioral", "cultural fit")
+# Every TOPIC_SWITCH_AFTER-th interviewer reply starts a new topic from the bank
+TOPIC_SWITCH_AFTER = int(os.getenv("TOPIC_SWITCH_AFTER", 3))
+
+
+def _norm(value):
+    return re.sub(r'\s+', ' ', str(value)).strip().lower()
+
+
+def encode_questions(questions):
+    return zlib.compress(json.dumps(questions, separators=(",", ":")).encode(), 9)
+
+
+def decode_questions(blob):
+    return json.loads(zlib.decompress(blob).decode())
+
+
+def create_bank(path):
+    """Create an empty bank file and return its connection"""
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS questions ("
+        "role TEXT NOT NULL, level TEXT NOT NULL, qtype TEXT NOT NULL, body BLOB NOT NULL, "
+        "PRIMARY KEY (role, level, qtype))"
+    )
+    return conn
+
+
+def store_questions(conn, role, level, qtype, questions):
+    conn.execute(
+        "INSERT OR REPLACE INTO questions (role, level, qtype, body) VALUES (?, ?, ?, ?)",
+        (_norm(role), _norm(level), _norm(qtype), encode_questions(questions)),
+    )
+
+
+class QuestionBank:
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self.questions = lru_cache(maxsize=512)(self._load)
+
+    @property
+    def available(self):
+        return os.path.exists(self.path)
+
+    def _load(self, role, level, qtype):
+        with self._lock:
+            if self._conn is None:
+                # Read-only, shared by every session's script thread
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            row = self._conn.execute(
+                "SELECT body FROM questions WHERE role = ? AND level = ? AND qtype = ?", (role, level, qtype)
+            ).fetchone()
+        return tuple(decode_questions(row[0])) if row else ()
+
+    def pick(self, role, level, qtype, exclude=(), rng=random):
+        """A random question not in exclude, or None if the bank has none left for this key"""
+        if not self.available:
+            return None
+        choices = [q for q in self.questions(_norm(role), _norm(level), _norm(qtype)) if q not in exclude]
+        return rng.choice(choices) if choices else None
+
+
+class TopicPlanner:
+    """Decides which turns of one interview come straight from the bank.
+
+    The opener and every topic switch (every TOPIC_SWITCH_AFTER-th reply)
+    are bank questions, rotating through the question types. All other turns
+    are answer-dependent follow-ups left to the LLM.
+    """
+
+    def __init__(self, bank, role, level, switch_after=None):
+        self.bank = bank
+        self.role = role
+        self.level = level
+        self.switch_after = switch_after or TOPIC_SWITCH_AFTER
+        self.asked = set()
+        self._type_index = 0
+        self._since_switch = 0
+        self.bank_turns = 0
+
+    def _next_question(self):
+        for offset in range(len(QUESTION_TYPES)):
+            qtype = QUESTION_TYPES[(self._type_index + offset) % len(QUESTION_TYPES)]
+            question = self.bank.pick(self.role, self.level, qtype, self.asked)
+            if question:
+                self._type_index = (self._type_index + offset + 1) % len(QUESTION_TYPES)
+                self.asked.add(question)
+                self._since_switch = 0
+                self.bank_turns += 1
+                return question
+        return None
+
+    def opener(self):
+        return self._next_question()
+
+    def next_turn(self):
+        """A bank question when it's time to switch topic, otherwise None (ask the LLM)"""
+        if self._since_switch + 1 >= self.switch_after:
+            question = self._next_question()
+            if question:
+                return question
+        self._since_switch += 1
+        return None
+
+
+question_bank = QuestionBank(QUESTION_BANK_PATH)
@@ -0,0 +1,263 @@
+"""Deadlines, retries, hedging and circuit breaking for outbound Gemini and ElevenLabs calls.
+
+The SDKs are synchronous, so each attempt runs on a bounded thread pool
+driven by one asyncio loop in a background thread. call_sync() is the entry
+point for the Streamlit script and worker threads:
+
+  - every call has a deadline that covers all of its attempts;
+  - transient failures (timeouts, connection errors, 429 and 5xx) are retried
+    with full-jitter exponential backoff while the deadline allows;
+  - with hedge_after set, a second attempt starts when the first is slower
+    than that, and whichever succeeds first wins;
+  - a CircuitBreaker fails calls fast after repeated calls gave up on
+    transient errors, which the app uses to fall back to text-only replies
+    while TTS is unhealthy;
+  - iter_with_timeout() bounds the wait for each chunk of a streamed
+    response, which the deadline can't cover once the call has returned.
+
+An attempt that misses its deadline can't be interrupted inside the SDK. Its
+thread finishes in the background and the result is dropped.
+"""
+import asyncio
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Optional
+
+logger = logging.getLogger("interview")
+
+# Threads available to attempts in flight, including abandoned ones still finishing
+CALL_WORKERS = int(os.getenv("CALL_WORKERS", 32))
+
+
+def _env_seconds(name, default=None):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    deadline: float  # seconds for the whole call, retries included
+    attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+    hedge_after: Optional[float] = None  # start a duplicate attempt after this many seconds
+    chunk_timeout: Optional[float] = None  # streamed responses: longest wait for the next chunk
+
+
+GEMINI_POLICY = CallPolicy(deadline=_env_seconds("GEMINI_DEADLINE", 30.0),
+                           hedge_after=_env_seconds("GEMINI_HEDGE_AFTER"),
+                           chunk_timeout=_env_seconds("GEMINI_CHUNK_TIMEOUT", 15.0))
+SUMMARY_POLICY = CallPolicy(deadline=60.0, attempts=2)
+EVALUATION_POLICY = CallPolicy(deadline=120.0, attempts=2)
+TTS_POLICY = CallPolicy(deadline=_env_seconds("TTS_DEADLINE", 15.0),
+                        hedge_after=_env_seconds("TTS_HEDGE_AFTER"))
+# Audio streamed to the browser can't have two writers, so it is never hedged
+TTS_STREAM_POLICY = replace(TTS_POLICY, hedge_after=None)
+
+
+class CallFailedError(RuntimeError):
+    pass
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+# Exception class names from the Gemini (google.api_core), ElevenLabs and httpx
+# stacks that are worth retrying; matched by name so no SDK has to be imported
+_TRANSIENT_NAMES = {
+    "ServiceUnavailable", "TooManyRequests", "ResourceExhausted", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "BadGateway", "Aborted",
+    "TimeoutException", "TransportError", "RemoteProtocolError",
+}
+
+
+def is_transient(exc):
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in _TRANSIENT_NAMES for cls in type(exc).__mro__):
+        return True
+    response = getattr(exc, "response", None)  # httpx.HTTPStatusError
+    status = (getattr(exc, "status_code", None) or getattr(exc, "code", None)
+              or getattr(response, "status_code", None))
+    return isinstance(status, int) and (status == 429 or 500 <= status < 600)
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failed calls; after reset_after seconds one trial call is let through"""
+
+    def __init__(self, name, failure_threshold=3, reset_after=30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def available(self):
+        """False while open and still cooling down, i.e. calls would fail fast"""
+        with self._lock:
+            return self.state != "open" or self._clock() - self._opened_at >= self.reset_after
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self._clock() - self._opened_at >= self.reset_after:
+                self.state = "half_open"  # this caller is the trial
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logger.info("%s circuit closed", self.name)
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning("%s circuit opened after %d failures", self.name, self._failures)
+                self.state = "open"
+                self._opened_at = self._clock()
+
+
+tts_breaker = CircuitBreaker("tts")
+
+# attempts, retries, hedges, hedge_wins, gave_up; only updated on the loop thread
+call_stats = Counter()
+
+_executor = None
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    global _executor, _loop
+    with _loop_lock:
+        if _loop is None:
+            _executor = ThreadPoolExecutor(max_workers=CALL_WORKERS, thread_name_prefix="call")
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="call-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def _start(fn):
+    future = asyncio.get_running_loop().run_in_executor(_executor, fn)
+    # Abandoned attempts may still fail later; retrieve their error so it isn't logged as unhandled
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    call_stats["attempts"] += 1
+    return future
+
+
+async def _attempt(fn, hedge_after):
+    first = _start(fn)
+    if hedge_after is None:
+        return await first
+    done, _ = await asyncio.wait({first}, timeout=hedge_after)
+    if done:
+        return first.result()
+    call_stats["hedges"] += 1
+    pending = {first, _start(fn)}
+    error = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is not first:
+                    call_stats["hedge_wins"] += 1
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+async def call(fn, policy, breaker=None):
+    """Run the zero-argument callable fn under policy; raises the last error if every attempt fails"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + policy.deadline
+    error = None
+    # The breaker counts logical calls: it is asked once, and told once how the call ended
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpenError(f"{breaker.name} is unavailable after repeated failures")
+    for attempt in range(policy.attempts):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            result = await asyncio.wait_for(_attempt(fn, policy.hedge_after), remaining)
+        except Exception as e:
+            if not is_transient(e):
+                # The service answered (e.g. a 400), so it is available even though this call failed
+                if breaker is not None:
+                    breaker.record_success()
+                raise
+            error = e
+            # Full jitter keeps concurrent sessions from retrying in lockstep
+            delay = random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** attempt))
+            if attempt + 1 == policy.attempts or loop.time() + delay >= deadline:
+                break
+            call_stats["retries"] += 1
+            logger.info("retrying after %s (attempt %d/%d)", type(e).__name__, attempt + 1, policy.attempts)
+            await asyncio.sleep(delay)
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+    call_stats["gave_up"] += 1
+    if breaker is not None:
+        breaker.record_failure()
+    raise CallFailedError(f"gave up within the {policy.deadline:g}s deadline: {error!r}") from error
+
+
+def call_sync(fn, policy, breaker=None):
+    """Blocking call() for synchronous code such as the Streamlit script or a worker thread"""
+    return asyncio.run_coroutine_threadsafe(call(fn, policy, breaker), _background_loop()).result()
+
+
+_END = object()
+
+
+def iter_with_timeout(iterable, timeout):
+    """Yield the items of iterable, raising TimeoutError when the next one takes longer than timeout seconds.
+
+    The iterable is consumed on a daemon thread. After a timeout that thread is
+    abandoned and its remaining items are dropped.
+    """
+    if timeout is None:
+        yield from iterable
+        return
+    items = queue.Queue()
+
+    def produce():
+        try:
+            for item in iterable:
+                items.put((item, None))
+        except Exception as e:
+            items.put((None, e))
+        items.put((_END, None))
+
+    threading.Thread(target=produce, name="stream-reader", daemon=True).start()
+    while True:
+        try:
+            item, error = items.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"no streamed chunk within {timeout:g}s") from None
+        if error is not None:
+            raise error
+        if item is _END:
+            return
+        yield item
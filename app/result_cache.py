@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(current_dir, ".cache", "results.sqlite"))
+# Set RESULT_CACHE_MAX_BYTES=0 to disable the cache
+CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+class ResultCache:
+    """Persistent SQLite cache of JSON results with size-based LRU eviction"""
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = None  # running total of the size column, read from the table once
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _connect(self):
+        # One connection per process: batch workers fork after the module is imported
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        data = json.dumps(value)
+        with self._lock:
+            conn = self._connect()
+            if self._bytes is None:
+                self._bytes = self._total(conn)
+            old = conn.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._bytes += len(data) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict(conn)
+
+    @staticmethod
+    def _total(conn):
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def _evict(self, conn):
+        # Other processes write to the same file, so the running total is checked against the table first
+        total = self._total(conn)
+        if total > self.max_bytes:
+            # Drop least recently used entries until the cache fits again
+            for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_access").fetchall():
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._bytes = total
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        entries = size = 0
+        if self.enabled:
+            with self._lock:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+def make_key(kind, content_hash, version):
+    """Cache key for a result derived from a file's content and a model/taxonomy version"""
+    return f"{kind}:{version}:{content_hash}"
+
+
+def file_version(*paths):
+    """Short content hash of one or more files, used to version cached results"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+cache = ResultCache(CACHE_PATH, CACHE_MAX_BYTES)
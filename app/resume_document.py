@@ -0,0 +1,128 @@
+import hashlib
+import os
+import re
+import time
+from functools import cached_property
+
+# Limits for uploaded PDFs; override with environment variables
+MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", 20))
+MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", 100_000))
+MAX_SECONDS = float(os.getenv("RESUME_MAX_SECONDS", 5.0))
+# Bump when text extraction changes so results cached from older parses are not reused
+PARSER_VERSION = 1
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised before any text is extracted when a PDF has more pages than allowed"""
+
+
+class ResumeDocument:
+    """An uploaded resume, opened once; the text views are computed lazily and cached"""
+
+    def __init__(self, file_bytes, max_pages=None, max_chars=None, max_seconds=None):
+        self.file_bytes = file_bytes
+        self.max_pages = max_pages or MAX_PAGES
+        self.max_chars = max_chars or MAX_CHARS
+        self.max_seconds = max_seconds or MAX_SECONDS
+        # Set when extraction stopped early because of the character or time limit
+        self.truncated = False
+        self._pages = []
+        self._reader = None
+        self._exhausted = False
+
+    @cached_property
+    def sha256(self):
+        return hashlib.sha256(self.file_bytes).hexdigest()
+
+    @property
+    def extraction_version(self):
+        """Parser version and page/character limits: everything besides the bytes that shapes the text"""
+        return f"p{PARSER_VERSION}.{self.max_pages}.{self.max_chars}"
+
+    @cached_property
+    def _doc(self):
+        import fitz  # PyMuPDF, imported on first use to keep startup fast
+        doc = fitz.open(stream=self.file_bytes, filetype="pdf")
+        self._page_count = doc.page_count
+        # Cheap check: the page count comes from the PDF structure, no text is extracted
+        if self._page_count > self.max_pages:
+            doc.close()
+            raise ResumeTooLargeError(
+                f"Resume has {self._page_count} pages, the limit is {self.max_pages}."
+            )
+        return doc
+
+    @property
+    def page_count(self):
+        self._doc  # opens the PDF and enforces the page limit
+        return self._page_count
+
+    def _read_pages(self):
+        doc = self._doc
+        deadline = time.monotonic() + self.max_seconds
+        remaining = self.max_chars
+        try:
+            for page in doc:
+                if time.monotonic() > deadline:
+                    self.truncated = True
+                    return
+                text = page.get_text()
+                if len(text) >= remaining:
+                    self.truncated = len(text) > remaining or page.number < doc.page_count - 1
+                    yield text[:remaining]
+                    return
+                remaining -= len(text)
+                yield text
+        finally:
+            self._exhausted = True
+            doc.close()
+
+    def iter_pages(self):
+        """Yield page text one page at a time; pages already read are served from memory"""
+        i = 0
+        while True:
+            if i < len(self._pages):
+                yield self._pages[i]
+                i += 1
+                continue
+            if self._exhausted:
+                return
+            if self._reader is None:
+                self.page_count  # raises ResumeTooLargeError before reading any page
+                self._reader = self._read_pages()
+            try:
+                self._pages.append(next(self._reader))
+            except StopIteration:
+                return
+
+    @cached_property
+    def pages(self):
+        return list(self.iter_pages())
+
+    @cached_property
+    def raw_text(self):
+        return "\n".join(self.pages)
+
+    @cached_property
+    def clean_text(self):
+        return normalize_text(self.raw_text)
+
+    @cached_property
+    def lemmatized_text(self):
+        # The classifier input. Imported here so resume parsing does not pull in NLTK.
+        from jobrole_prediction import preprocess_for_model
+        return preprocess_for_model(self.raw_text)
+
+
+def normalize_text(text):
+    # Collapse whitespace and drop non-ASCII: the input for regex entity extraction
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\x00-\x7F]+', '', text)
+    return text.strip()
+
+
+def as_document(data):
+    """Wrap raw PDF bytes in a ResumeDocument; documents are passed through unchanged"""
+    if isinstance(data, ResumeDocument):
+        return data
+    return ResumeDocument(data)
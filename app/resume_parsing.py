@@ -1,20 +1,27 @@
-import streamlit as st
-import fitz  # PyMuPDF
 import io
 import re
+import os
+from functools import lru_cache
+from skill_matcher import SkillMatcher, load_taxonomy
+from resume_document import as_document, normalize_text
+from result_cache import cache, make_key
 
 def extract_clean_text(bytes_data):
-    doc = fitz.open(stream=bytes_data, filetype="pdf")
-    # Extract text from each page
-    text = "\n".join([page.get_text() for page in doc])
-    #cleaning the txt
-    info = clean_text(text)
-    return info 
+    # Accepts raw PDF bytes or a ResumeDocument shared with jobrole_prediction.
+    # Pages are read one at a time.
+    doc = as_document(bytes_data)
+    # Full parses are cached by file content, extraction limits and taxonomy version
+    key = make_key("info", doc.sha256, f"{doc.extraction_version}.{skill_matcher.version}")
+    info = cache.get(key)
+    if info is None:
+        info = extract_info_from_pages(doc.iter_pages())
+        # Partial parses (stopped by the character or time limit) are returned but not cached
+        if not doc.truncated:
+            cache.put(key, info)
+    return info
 def clean_text(text):
     # Remove extra spaces, line breaks, and special characters
-    text = re.sub(r'\s+', ' ', text)         # Remove extra whitespace
-    text = re.sub(r'[^\x00-\x7F]+', '', text) # Remove non-ASCII
-    info = extract_info(text.strip(),tech_skills)
+    info = extract_info(normalize_text(text),tech_skills)
     return info
 
 def extract_email(text):
@@ -42,13 +49,14 @@ def extract_name(text):
 
 
 
-def extract_skills(text, skill_list):
-    text_lower = text.lower()
-    found = set()
-    for skill in skill_list:
-        if re.search(rf'\b{re.escape(skill.lower())}\b', text_lower):
-            found.add(skill.lower())
-    return list(found)
+def extract_skills(text, skill_list=None):
+    # One pass over the text with a prebuilt automaton instead of one regex per skill
+    matcher = skill_matcher if skill_list is None or skill_list is tech_skills else _matcher_for(tuple(skill_list))
+    return list(matcher.skills(text))
+
+@lru_cache(maxsize=8)
+def _matcher_for(skill_list):
+    return SkillMatcher(skill_list)
 
 tech_skills = """
 python
@@ -116,6 +124,50 @@ selenium
 api integration
 """.strip().split('\n')
 
+# Common spellings and abbreviations, reported under the canonical skill name
+skill_aliases = {
+    "kubernetes": ["k8s"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "node.js": ["nodejs", "node js"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud platform", "google cloud"],
+    "huggingface": ["hugging face"],
+    "power bi": ["powerbi"],
+    "vs code": ["vscode", "visual studio code"],
+    "beautifulsoup": ["beautiful soup", "bs4"],
+    "rest api": ["restful api", "rest apis"],
+    "fine-tuning": ["fine tuning", "finetuning"],
+}
+
+def build_skill_matcher(taxonomy_path=None):
+    """Build the skill matcher from a JSON taxonomy file, or from the built-in list"""
+    if taxonomy_path:
+        return SkillMatcher(load_taxonomy(taxonomy_path))
+    return SkillMatcher({skill: skill_aliases.get(skill, []) for skill in tech_skills})
+
+# Built once at import; set SKILL_TAXONOMY_PATH to load a larger taxonomy
+skill_matcher = build_skill_matcher(os.getenv("SKILL_TAXONOMY_PATH"))
+
+def extract_info_from_pages(pages):
+    """Run entity extraction page by page, skipping fields that are already found"""
+    info = {"name": None, "email": None, "phone": None, "linkedin": None, "github": None}
+    skills = set()
+    for page in pages:
+        text = normalize_text(page)
+        if info["name"] is None:
+            info["name"] = extract_name(text)
+        if info["email"] is None:
+            info["email"] = extract_email(text)
+        if info["phone"] is None:
+            info["phone"] = extract_phone(text)
+        if info["linkedin"] is None or info["github"] is None:
+            linkedin, github = extract_links(text)
+            info["linkedin"] = info["linkedin"] or linkedin
+            info["github"] = info["github"] or github
+        skills |= skill_matcher.skills(text)
+    info["skills"] = list(skills)
+    return info
+
 def extract_info(text, skills_list):
     return {
         "name": extract_name(text),
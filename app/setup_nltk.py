@@ -0,0 +1,9 @@
+"""Download the NLTK data used for resume preprocessing.
+
+The app never downloads anything at import time; run this once per environment:
+    python app/setup_nltk.py
+"""
+from jobrole_prediction import download_nltk_data
+
+if __name__ == "__main__":
+    download_nltk_data()
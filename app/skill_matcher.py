@@ -0,0 +1,111 @@
+import hashlib
+import json
+from collections import Counter, deque
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton that finds every known skill (and alias) in one pass over the text"""
+
+    def __init__(self, taxonomy):
+        # taxonomy: {canonical skill: [aliases]} or a plain list of skills
+        if not isinstance(taxonomy, dict):
+            taxonomy = {skill: [] for skill in taxonomy}
+
+        # State 0 is the root. Each state has a dict of transitions, a failure
+        # link and the list of (pattern length, canonical skill) ending there.
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self.canonical = {}
+
+        for skill, aliases in taxonomy.items():
+            canonical = skill.strip().lower()
+            for surface in [skill, *aliases]:
+                surface = surface.strip().lower()
+                if surface:
+                    self._add(surface, canonical)
+        self._build_failure_links()
+        # Changes whenever the taxonomy does; used to version cached parse results
+        self.version = hashlib.sha256(
+            json.dumps(sorted(self.canonical.items())).encode()
+        ).hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.canonical)
+
+    def _add(self, surface, canonical):
+        if surface in self.canonical:
+            return
+        self.canonical[surface] = canonical
+        state = 0
+        for ch in surface:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(surface), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Inherit the outputs of the longest proper suffix
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def finditer(self, text):
+        """Yield (start, end, canonical skill) for every whole-word match, in order of end position"""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            # A match only counts on word boundaries, like \b in the old regex loop
+            if end < n and _is_word_char(text[end]) and _is_word_char(ch):
+                continue
+            for length, canonical in out[state]:
+                start = end - length
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                yield start, end, canonical
+
+    def find_all(self, text):
+        """Return {canonical skill: [(start, end), ...]} for all matches in the text"""
+        positions = {}
+        for start, end, canonical in self.finditer(text):
+            positions.setdefault(canonical, []).append((start, end))
+        return positions
+
+    def count(self, text):
+        """Return a Counter of canonical skill -> number of occurrences"""
+        return Counter(canonical for _, _, canonical in self.finditer(text))
+
+    def skills(self, text):
+        """Return the set of canonical skills present in the text"""
+        return {canonical for _, _, canonical in self.finditer(text)}
+
+
+def load_taxonomy(path):
+    """Load a skill taxonomy from JSON: either a list of skills or {skill: [aliases]}"""
+    with open(path, 'r') as f:
+        return json.load(f)
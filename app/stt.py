@@ -1,22 +1,306 @@
-import streamlit as st
-import speech_recognition as sr
+"""Speech-to-text for recorded answers.
+
+The engine is chosen with STT_BACKEND:
+
+    google          Google Web Speech API through SpeechRecognition (default, needs network)
+    faster-whisper  local Whisper on CPU with int8 weights; STT_MODEL is a size
+                    ("base.en") or a converted model directory
+    vosk            local Kaldi model; STT_MODEL is the unpacked model directory
+
+A local engine's model is loaded once per process and shared by every
+session. Inference runs on a pool of STT_WORKERS threads so concurrent
+answers can't oversubscribe the CPU.
+
+Long answers are cut at pauses (frame energy below a level derived from the
+recording itself) into segments of about STT_SEGMENT_SECONDS, which are
+transcribed concurrently and joined in order. Segment transcripts are cached,
+so a retry after a failure only sends the segments that failed.
+"""
+import hashlib
+import io
+import json
+import logging
 import os
-import time
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
+STT_BACKEND = os.getenv("STT_BACKEND", "google")
+STT_MODEL = os.getenv("STT_MODEL")
+STT_LANGUAGE = os.getenv("STT_LANGUAGE", "en")
+STT_WORKERS = int(os.getenv("STT_WORKERS", 2))
+# Recordings shorter than twice this are transcribed in one piece
+STT_SEGMENT_SECONDS = float(os.getenv("STT_SEGMENT_SECONDS", 15))
+# Shortest pause that counts as a place to cut
+STT_MIN_SILENCE = float(os.getenv("STT_MIN_SILENCE", 0.4))
+STT_SEGMENT_CACHE = int(os.getenv("STT_SEGMENT_CACHE", 256))
 
+# Local engines take 16 kHz mono 16-bit PCM
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
 
-def transcribe_audio(audio_file_path):
-    recognizer = sr.Recognizer()
-    try:
-        with sr.AudioFile(audio_file_path) as source:
-            audio_data = recognizer.record(source)
+# Recordings transcribed and reruns skipped by fingerprint, across all sessions
+stt_stats = Counter()
+
+_executor = None
+_executor_lock = threading.Lock()
+_backends = {}
+_backend_lock = threading.Lock()
+_warm_up_started = False
+
+logger = logging.getLogger("interview")
+
+
+def shared_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=STT_WORKERS, thread_name_prefix="stt")
+        return _executor
+
+
+class GoogleBackend:
+    name = "google"
+    model_name = None
+
+    def transcribe(self, audio_data):
+        import speech_recognition as sr
+        try:
+            return sr.Recognizer().recognize_google(audio_data)
+        except sr.UnknownValueError:
+            return ""
+
+
+class FasterWhisperBackend:
+    name = "faster-whisper"
+
+    def __init__(self, model=None, language=STT_LANGUAGE):
+        from faster_whisper import WhisperModel
+        # num_workers lets the pool's threads run inference concurrently on the one model
+        self.model_name = model or "base.en"
+        self.model = WhisperModel(self.model_name, device="cpu", compute_type="int8", num_workers=STT_WORKERS)
+        self.language = language
+
+    def transcribe(self, audio_data):
+        import numpy as np
+        pcm = audio_data.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self.model.transcribe(samples, language=self.language, beam_size=1)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+class VoskBackend:
+    name = "vosk"
+
+    def __init__(self, model=None):
+        if not model:
+            raise ValueError("STT_MODEL must point to an unpacked Vosk model directory")
+        import vosk
+        vosk.SetLogLevel(-1)
+        self.model_name = model
+        self.model = vosk.Model(model)
+
+    def transcribe(self, audio_data):
+        import vosk
+        # Recognizers are cheap and hold per-utterance state; the model is shared
+        recognizer = vosk.KaldiRecognizer(self.model, SAMPLE_RATE)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+        return json.loads(recognizer.FinalResult()).get("text", "")
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "faster-whisper": FasterWhisperBackend,
+    "vosk": VoskBackend,
+}
+
+
+def get_backend(name=None, model=None):
+    """The process-wide backend instance; a local model is loaded on the first call only.
+
+    A failed load is remembered and its error raised again on later calls,
+    so a missing package or model isn't retried on every request.
+    """
+    name = name or STT_BACKEND
+    model = model or STT_MODEL
+    key = (name, model)
+    with _backend_lock:
+        if key not in _backends:
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown STT_BACKEND {name!r}; expected one of {', '.join(BACKENDS)}")
             try:
-                return recognizer.recognize_google(audio_data)
-            except sr.UnknownValueError:
-                return "[Could not understand audio]"
-            except sr.RequestError:
-                return "[API unavailable]"
+                _backends[key] = BACKENDS[name]() if name == "google" else BACKENDS[name](model)
+            except Exception as e:
+                _backends[key] = e
+                logger.error("STT backend %s could not be loaded; the app falls back to google: %r", name, e)
+        backend = _backends[key]
+    if isinstance(backend, Exception):
+        raise backend
+    return backend
+
+
+def configured_backend():
+    """The STT_BACKEND engine, or Google speech recognition if it failed to load"""
+    try:
+        return get_backend()
+    except Exception:
+        return get_backend("google")
+
+
+def warm_up():
+    """Load the configured local model in the background so the first answer isn't delayed"""
+    global _warm_up_started
+    # Called on every Streamlit rerun; only the first one does any work
+    if STT_BACKEND != "google" and not _warm_up_started:
+        _warm_up_started = True
+        shared_executor().submit(configured_backend)
+
+
+@contextmanager
+def _temp_audio_file(audio, suffix=".wav"):
+    """Write audio to a temporary file that is always removed afterwards"""
+    fd, path = tempfile.mkstemp(prefix="interview-stt-", suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio)
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _record(recognizer, source):
+    import speech_recognition as sr
+    with sr.AudioFile(source) as audio_source:
+        return recognizer.record(audio_source)
+
+
+def load_audio(recognizer, audio):
+    """AudioData from a file path, or from WAV/AIFF/FLAC bytes decoded in memory"""
+    if isinstance(audio, (str, os.PathLike)):
+        return _record(recognizer, audio)
+    audio = memoryview(audio)
+    try:
+        return _record(recognizer, io.BytesIO(audio))
+    except ValueError:
+        # Some encoders write headers the in-memory readers reject but the
+        # path-based readers (flac converter included) accept
+        with _temp_audio_file(audio) as path:
+            return _record(recognizer, path)
+
+
+def fingerprint(audio):
+    """(length, digest) identifying a recording; compared before any decoding or transcription"""
+    return len(audio), hashlib.blake2b(audio, digest_size=16).digest()
+
+
+def split_on_silence(pcm, rate, segment_seconds=STT_SEGMENT_SECONDS, min_silence=STT_MIN_SILENCE):
+    """Byte ranges of 16-bit mono PCM, cut in the middle of pauses once a segment reaches segment_seconds"""
+    import numpy as np
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    frame = max(1, int(rate * FRAME_SECONDS))
+    frames = len(samples) // frame
+    step = frame / rate
+    if len(samples) / rate < 2 * segment_seconds:
+        return [(0, len(pcm))]
+    energy = np.sqrt(np.mean(samples[:frames * frame].reshape(frames, frame).astype(np.float64) ** 2, axis=1))
+    # Relative to the recording, so a noisy room or a quiet microphone still gives usable pauses
+    threshold = max(np.percentile(energy, 10) * 2, np.percentile(energy, 95) * 0.1)
+    silent = np.append(energy < threshold, False)
+
+    cuts, start, run = [0], 0, 0
+    min_run = int(min_silence / step)
+    for i, quiet in enumerate(silent):
+        if quiet:
+            run += 1
+            continue
+        if run >= min_run:
+            middle = i - run // 2
+            # No cut that would leave a short tail behind; it goes to the last segment instead
+            if (middle - start) * step >= segment_seconds and (frames - middle) * step >= segment_seconds / 2:
+                cuts.append(middle)
+                start = middle
+        run = 0
+    bounds = [cut * frame * 2 for cut in cuts] + [len(pcm)]
+    return list(zip(bounds, bounds[1:]))
+
+
+class SegmentCache:
+    """Transcripts of audio segments by content and backend; failures are never stored"""
+
+    def __init__(self, max_entries=STT_SEGMENT_CACHE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(backend, segment):
+        digest = hashlib.sha256(segment.frame_data).hexdigest()
+        return (backend.name, backend.model_name, segment.sample_rate, digest)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, text):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+segment_cache = SegmentCache()
+
+
+def _transcribe_segment(backend, segment):
+    key = segment_cache.key(backend, segment)
+    text = segment_cache.get(key)
+    if text is None:
+        text = backend.transcribe(segment)
+        segment_cache.put(key, text)
+    return text
+
+
+def transcribe_segments(backend, audio_data):
+    """Split audio_data at pauses, transcribe the pieces concurrently and join them in order"""
+    import speech_recognition as sr
+    pcm = audio_data.get_raw_data(convert_width=2)
+    segments = [sr.AudioData(pcm[start:end], audio_data.sample_rate, 2)
+                for start, end in split_on_silence(pcm, audio_data.sample_rate)]
+    futures = [shared_executor().submit(_transcribe_segment, backend, segment) for segment in segments]
+    # Wait for every segment, so the ones that succeeded are cached before any error is raised
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return " ".join(text for text in (future.result() for future in futures) if text)
+
+
+def transcribe_audio(audio, backend=None):
+    """Transcribe a recording given as raw audio bytes, a memoryview or a file path"""
+    import speech_recognition as sr  # imported on the first recording, not at app startup
+    stt_stats["transcribed"] += 1
+    try:
+        audio_data = load_audio(sr.Recognizer(), audio)
+        backend = backend or configured_backend()
+        try:
+            text = transcribe_segments(backend, audio_data)
+        except sr.RequestError:
+            return "[API unavailable]"
+        return text or "[Could not understand audio]"
     except Exception as e:
+        import streamlit as st
         st.error(f"Error processing audio: {str(e)}")
         return None
-
@@ -0,0 +1,189 @@
+"""Train the job-role classifier from the resume-atlas CSV (replaces Models/Job_role_prediction.ipynb).
+
+Preprocessing runs on a process pool. Two modes are available:
+
+  tfidf      TfidfVectorizer(max_features=5000) + LinearSVC, as in the notebook.
+             The cleaned corpus is held in memory; cross-validation runs in parallel.
+  streaming  HashingVectorizer + SGDClassifier.partial_fit over CSV chunks, so
+             corpora larger than RAM can be trained out of core.
+
+Each run writes a versioned artifact directory with model.pkl,
+tfidf_vectorizer.pkl, labels.json and metadata.json. --install copies them
+next to the app, where the running app picks them up on its next prediction.
+
+    python app/train_model.py resume-atlas.csv --mode tfidf --cv 5 --install
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+from datetime import datetime
+from multiprocessing import Pool
+
+import pandas as pd
+
+from jobrole_prediction import preprocess_text, MODEL_PATH, VEC_PATH, LABELS_PATH
+
+DEFAULT_CSV = "hf://datasets/ahmedheakl/resume-atlas/train.csv"
+current_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_DIR = os.path.join(current_dir, '..', 'Models', 'artifacts')
+
+
+def iter_chunks(csv_path, chunksize, text_column, label_column):
+    """Yield (texts, labels) lists from the CSV without loading it whole"""
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, usecols=[text_column, label_column]):
+        chunk = chunk.dropna()
+        yield chunk[text_column].astype(str).tolist(), chunk[label_column].astype(str).tolist()
+
+
+def clean_chunks(pool, workers, chunks):
+    """Preprocess each chunk's texts across the worker pool"""
+    for texts, labels in chunks:
+        yield pool.map(preprocess_text, texts, chunksize=max(1, len(texts) // (workers * 4))), labels
+
+
+def train_tfidf(pool, args):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVC
+    from sklearn.metrics import accuracy_score
+
+    texts, labels = [], []
+    for cleaned, chunk_labels in clean_chunks(pool, args.workers, iter_chunks(args.csv, args.chunksize, args.text_column, args.label_column)):
+        texts.extend(cleaned)
+        labels.extend(chunk_labels)
+        print(f"preprocessed {len(texts)} resumes", file=sys.stderr)
+
+    metrics = {"rows": len(texts)}
+    if args.cv > 1:
+        # The vectorizer is refit inside each fold so held-out folds stay unseen
+        pipeline = make_pipeline(TfidfVectorizer(max_features=args.max_features), LinearSVC(random_state=args.seed))
+        folds = StratifiedKFold(n_splits=args.cv, shuffle=True, random_state=args.seed)
+        scores = cross_val_score(pipeline, texts, labels, cv=folds, n_jobs=args.workers)
+        metrics["cv_accuracy"] = [round(float(s), 4) for s in scores]
+        print(f"cross-validation accuracy: {scores.mean():.4f} +/- {scores.std():.4f}", file=sys.stderr)
+
+    X_train, X_test, y_train, y_test = train_test_split(texts, labels, test_size=0.2, random_state=args.seed)
+    vectorizer = TfidfVectorizer(max_features=args.max_features)
+    model = LinearSVC(random_state=args.seed)
+    model.fit(vectorizer.fit_transform(X_train), y_train)
+    metrics["holdout_accuracy"] = round(float(accuracy_score(y_test, model.predict(vectorizer.transform(X_test)))), 4)
+    print(f"hold-out accuracy: {metrics['holdout_accuracy']:.4f}", file=sys.stderr)
+
+    # Deliberate change from the notebook, which pickled the model fitted on the 80% training split:
+    # once the hold-out score is recorded, the saved model is refit on every row
+    model.fit(vectorizer.fit_transform(texts), labels)
+    return model, vectorizer, metrics
+
+
+def train_streaming(pool, args):
+    import numpy as np
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.linear_model import SGDClassifier
+
+    # First pass reads only the label column to learn the full class list
+    classes = set()
+    for chunk in pd.read_csv(args.csv, chunksize=args.chunksize, usecols=[args.label_column]):
+        classes.update(chunk[args.label_column].dropna().astype(str))
+    classes = np.array(sorted(classes))
+
+    vectorizer = HashingVectorizer(n_features=args.hash_features, alternate_sign=False, norm="l2")
+    model = SGDClassifier(loss="hinge", alpha=args.alpha, random_state=args.seed)
+    rows = correct = tested = 0
+    for epoch in range(args.epochs):
+        row = 0
+        for cleaned, labels in clean_chunks(pool, args.workers, iter_chunks(args.csv, args.chunksize, args.text_column, args.label_column)):
+            # Every fifth row is held out for evaluation, the same rows in every epoch
+            train_idx = [i for i in range(len(labels)) if (row + i) % 5]
+            test_idx = [i for i in range(len(labels)) if not (row + i) % 5]
+            row += len(labels)
+            X = vectorizer.transform(cleaned)
+            y = np.array(labels)
+            if train_idx:
+                model.partial_fit(X[train_idx], y[train_idx], classes=classes)
+            if test_idx and epoch == args.epochs - 1:
+                correct += int((model.predict(X[test_idx]) == y[test_idx]).sum())
+                tested += len(test_idx)
+            print(f"epoch {epoch + 1}/{args.epochs}: {row} resumes", file=sys.stderr)
+        rows = row
+    metrics = {"rows": rows, "epochs": args.epochs}
+    if tested:
+        # Measured chunk by chunk while the last epoch was still training
+        metrics["holdout_accuracy"] = round(correct / tested, 4)
+        print(f"hold-out accuracy: {metrics['holdout_accuracy']:.4f}", file=sys.stderr)
+    return model, vectorizer, metrics
+
+
+def write_artifacts(model, vectorizer, metrics, args):
+    import sklearn
+    version = args.version or datetime.now().strftime("%Y%m%d-%H%M%S")
+    out_dir = os.path.join(args.output_dir, version)
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "model.pkl"), 'wb') as f:
+        pickle.dump(model, f)
+    with open(os.path.join(out_dir, "tfidf_vectorizer.pkl"), 'wb') as f:
+        pickle.dump(vectorizer, f)
+    # Column order of decision_function, so predictions no longer rely on a hard-coded list
+    with open(os.path.join(out_dir, "labels.json"), 'w') as f:
+        json.dump([str(label) for label in model.classes_], f, indent=2)
+    metadata = {
+        "version": version,
+        "mode": args.mode,
+        "csv": args.csv,
+        "seed": args.seed,
+        "sklearn_version": sklearn.__version__,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        **metrics,
+    }
+    with open(os.path.join(out_dir, "metadata.json"), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return out_dir
+
+
+def install(out_dir):
+    """Copy an artifact directory over the model files the app loads"""
+    for name, target in [("model.pkl", MODEL_PATH), ("tfidf_vectorizer.pkl", VEC_PATH), ("labels.json", LABELS_PATH)]:
+        # Copy then rename so a running app never reads a half-written file
+        tmp = target + ".tmp"
+        shutil.copyfile(os.path.join(out_dir, name), tmp)
+        os.replace(tmp, target)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the job-role classifier.")
+    parser.add_argument("csv", nargs="?", default=DEFAULT_CSV, help="CSV with resume text and category columns")
+    parser.add_argument("--mode", choices=["tfidf", "streaming"], default="tfidf")
+    parser.add_argument("--text-column", default="Text")
+    parser.add_argument("--label-column", default="Category")
+    parser.add_argument("--chunksize", type=int, default=2000, help="CSV rows read at a time")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="preprocessing / CV processes")
+    parser.add_argument("--cv", type=int, default=5, help="cross-validation folds for tfidf mode (0 to skip)")
+    parser.add_argument("--max-features", type=int, default=5000, help="TF-IDF vocabulary size")
+    parser.add_argument("--hash-features", type=int, default=2 ** 20, help="HashingVectorizer size for streaming mode")
+    parser.add_argument("--alpha", type=float, default=1e-5, help="SGDClassifier regularisation for streaming mode")
+    parser.add_argument("--epochs", type=int, default=3, help="passes over the CSV in streaming mode")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--version", help="artifact version (default: a timestamp)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--install", action="store_true", help="copy the new artifacts into app/ for serving")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        train = train_tfidf if args.mode == "tfidf" else train_streaming
+        model, vectorizer, metrics = train(pool, args)
+    metrics["train_seconds"] = round(time.perf_counter() - start, 1)
+    out_dir = write_artifacts(model, vectorizer, metrics, args)
+    print(f"artifacts written to {out_dir}", file=sys.stderr)
+    if args.install:
+        install(out_dir)
+        print("installed into the app directory", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
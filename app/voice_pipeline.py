@@ -0,0 +1,189 @@
+"""Sentence-pipelined text-to-speech.
+
+The streamed interviewer reply is cut into sentences as it arrives and each
+sentence is sent to TTS on a shared thread pool, so the first sentence can be
+playing while Gemini is still writing the rest. Audio is handed back in
+sentence order, either finished or as a media_server stream URL, and queued
+for playback in the browser.
+"""
+import base64
+import json
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Concurrent TTS requests per process, shared by every session
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", 4))
+
+# Sentence end: terminal punctuation, optional closing quotes/brackets, then whitespace
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def shared_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+        return _executor
+
+
+class SentenceSplitter:
+    """Buffers streamed text and returns sentences as soon as they are complete"""
+
+    def __init__(self, min_chars=20):
+        # Very short sentences ("Great.") are merged into the next one to save a TTS round trip
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text):
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if match.end() - start < self.min_chars:
+                continue
+            sentences.append(self._buffer[start:match.end()].strip())
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self):
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+class VoicePipeline:
+    """Synthesizes the sentences of one reply concurrently and returns their audio in order.
+
+    synthesize(sentence) -> audio bytes runs on the worker pool. feed() takes
+    streamed text, close() submits the last partial sentence, ready() yields the
+    segments already finished without blocking and drain() waits for the rest.
+    Segments are (index, audio, error) with exactly one of audio/error set.
+
+    With open_stream, synthesize(sentence, stream) writes the audio into a
+    media_server.MediaStream instead. Each segment then carries the stream's
+    URL as soon as the sentence is submitted, so the browser can start playing
+    while synthesis is still running. wait() returns the synthesis errors.
+    """
+
+    def __init__(self, synthesize, executor=None, splitter=None, open_stream=None):
+        self._synthesize = synthesize
+        self._executor = executor or shared_executor()
+        self._splitter = splitter or SentenceSplitter()
+        self._open_stream = open_stream
+        self._futures = deque()
+        self._urls = deque()
+        self._streaming = []
+        self._next_index = 0
+
+    def submit(self, sentence):
+        if self._open_stream is None:
+            self._futures.append(self._executor.submit(self._synthesize, sentence))
+            return
+        stream = self._open_stream()
+        self._streaming.append(self._executor.submit(self._synthesize, sentence, stream))
+        self._urls.append(stream.url)
+
+    def feed(self, text):
+        for sentence in self._splitter.feed(text):
+            self.submit(sentence)
+
+    def close(self):
+        for sentence in self._splitter.flush():
+            self.submit(sentence)
+
+    def ready(self):
+        while self._urls:
+            yield self._segment(self._urls.popleft(), None)
+        # Stops at the first unfinished sentence so playback order is kept
+        while self._futures and self._futures[0].done():
+            yield self._pop()
+
+    def drain(self):
+        yield from self.ready()
+        while self._futures:
+            yield self._pop()
+
+    def wait(self):
+        """Wait for streamed sentences to finish and return their errors"""
+        errors = []
+        for future in self._streaming:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(e)
+        self._streaming = []
+        return errors
+
+    def _pop(self):
+        future = self._futures.popleft()
+        try:
+            return self._segment(future.result(), None)
+        except Exception as e:
+            return self._segment(None, e)
+
+    def _segment(self, source, error):
+        index = self._next_index
+        self._next_index += 1
+        return index, source, error
+
+
+# Installed once into the Streamlit page (the parent of the component iframes) so
+# playback survives the iframes that deliver the segments. Segments of the current
+# turn play back to back in index order; a new turn stops the previous one.
+_PLAYER_JS = """
+window.__interviewAudio = window.__interviewAudio || (function () {
+  const q = {turn: null, next: 0, segments: {}, audio: null};
+  function playNext() {
+    if (q.audio || !(q.next in q.segments)) return;
+    const audio = q.segments[q.next];
+    delete q.segments[q.next];
+    q.next += 1;
+    if (audio === null) { playNext(); return; }
+    q.audio = audio;
+    const done = () => { q.audio = null; playNext(); };
+    q.audio.onended = done;
+    q.audio.onerror = done;
+    q.audio.play().catch(done);
+  }
+  return {
+    push(turn, index, src) {
+      if (q.turn !== turn) {
+        if (q.audio) { q.audio.pause(); q.audio = null; }
+        q.turn = turn; q.next = 0; q.segments = {};
+      }
+      // Created on arrival so streamed segments start buffering while earlier ones play
+      q.segments[index] = src === null ? null : new Audio(src);
+      if (q.segments[index]) q.segments[index].preload = "auto";
+      playNext();
+    }
+  };
+})();
+"""
+
+
+def segment_html(turn, index, source, mime="audio/mpeg"):
+    """HTML for a zero-height component that queues one segment in the page's player.
+
+    source is a media URL, inline audio bytes, or None to skip the segment.
+    """
+    if isinstance(source, str):
+        src = source
+    elif source:
+        src = f"data:{mime};base64,{base64.b64encode(source).decode('ascii')}"
+    else:
+        src = None
+    return f"""<script>
+const w = window.parent;
+if (!w.__interviewAudio) {{
+  const s = w.document.createElement("script");
+  s.textContent = {json.dumps(_PLAYER_JS)};
+  w.document.head.appendChild(s);
+}}
+w.__interviewAudio.push({json.dumps(turn)}, {index}, {json.dumps(src)});
+</script>"""
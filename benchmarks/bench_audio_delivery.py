@@ -0,0 +1,123 @@
+"""Peak memory and time to first audio byte per turn for the three audio delivery paths.
+
+A fake TTS produces each sentence of a reply as a series of MP3-sized chunks
+at ElevenLabs-like pace. Each turn is delivered three ways:
+
+    whole reply   the original generate_audio: join every chunk, base64 it and
+                  put one <audio> data URL in the page markdown
+    inline        sentence pipeline, each sentence base64-inlined into the page
+    streamed      sentence pipeline through the local media endpoint; the page
+                  only gets URLs and a reader thread plays the role of the browser
+
+Peak memory is the tracemalloc peak for the turn. The page markup is kept
+alive until the turn ends, as Streamlit keeps it while the messages are sent.
+"page KiB" is what goes through the Streamlit websocket.
+
+Run from the repository root:
+    python benchmarks/bench_audio_delivery.py
+"""
+import base64
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from media_server import MediaServer
+from voice_pipeline import VoicePipeline, segment_html
+
+SENTENCES = [f"This is sentence number {i} of the interviewer's reply, long enough to matter. " for i in range(8)]
+CHUNKS_PER_SENTENCE = 24
+CHUNK_BYTES = 4096
+CHUNK_DELAY = 0.01
+
+
+def fake_tts(text):
+    for _ in range(CHUNKS_PER_SENTENCE):
+        time.sleep(CHUNK_DELAY)
+        yield os.urandom(CHUNK_BYTES)
+
+
+def whole_reply():
+    start = time.perf_counter()
+    audio_bytes = b"".join(chunk for sentence in SENTENCES for chunk in fake_tts(sentence))
+    first_byte = time.perf_counter() - start
+    audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
+    html = f'<audio autoplay><source src="data:audio/mpeg;base64,{audio_base64}" type="audio/mpeg"></audio>'
+    return [html], first_byte
+
+
+def inline(executor):
+    start = time.perf_counter()
+    voice = VoicePipeline(lambda s: b"".join(fake_tts(s)), executor=executor)
+    page, first_byte = [], None
+    for sentence in SENTENCES:
+        voice.feed(sentence)
+    voice.close()
+    for index, audio, _ in voice.drain():
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+        page.append(segment_html("turn", index, audio))
+    return page, first_byte
+
+
+def streamed(executor, media):
+    def synthesize(sentence, stream):
+        for chunk in fake_tts(sentence):
+            stream.write(chunk)
+        stream.close()
+
+    first_byte = []
+    start = time.perf_counter()
+
+    def browser(url):
+        with urllib.request.urlopen(url) as response:
+            while response.read(CHUNK_BYTES):
+                if not first_byte:
+                    first_byte.append(time.perf_counter() - start)
+
+    voice = VoicePipeline(synthesize, executor=executor, open_stream=lambda: media.open_stream("bench"))
+    page, readers = [], []
+    for sentence in SENTENCES:
+        voice.feed(sentence)
+    voice.close()
+    for index, url, _ in voice.drain():
+        page.append(segment_html("turn", index, url))
+        reader = threading.Thread(target=browser, args=(url,))
+        reader.start()
+        readers.append(reader)
+    voice.wait()
+    for reader in readers:
+        reader.join()
+    return page, first_byte[0]
+
+
+def measure(name, fn, *args):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    page, first_byte = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    page_bytes = sum(map(len, page))
+    print(f"{name:<14}{peak / 1024:>12.0f}{page_bytes / 1024:>12.1f}{first_byte * 1000:>16.0f}")
+
+
+def main():
+    audio_kib = len(SENTENCES) * CHUNKS_PER_SENTENCE * CHUNK_BYTES / 1024
+    print(f"{len(SENTENCES)} sentences, {audio_kib:.0f} KiB of audio per turn")
+    executor = ThreadPoolExecutor(max_workers=4)
+    # Session budget large enough that nothing is dropped during the run
+    media = MediaServer("127.0.0.1", 0, session_bytes=64 * 1024 * 1024).start()
+    print(f"{'path':<14}{'peak KiB':>12}{'page KiB':>12}{'first byte ms':>16}")
+    measure("whole reply", whole_reply)
+    measure("inline", inline, executor)
+    measure("streamed", streamed, executor, media)
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Exercise the outbound call layer against a local fake API server.
+
+The server answers most requests quickly, answers a share of them slowly (the
+tail), and fails another share with 503. Requests go through the shared
+keep-alive httpx client. They are made with no policy, with retries, and with
+retries plus hedging, and success rate and p50/p95/p99 latency are reported
+for each. The server is then switched off to show the circuit breaker
+opening and failing calls fast.
+
+Run from the repository root (httpx must be installed; it comes with the ElevenLabs SDK):
+    python benchmarks/bench_call_policy.py
+"""
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from clients import clients
+from resilient_calls import CallPolicy, CircuitBreaker, call_sync, call_stats
+
+
+class FakeApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 64 * 1024  # send headers and body in one write
+    rng = random.Random(0)
+    slow_share = 0.1
+    error_share = 0.05
+    down = False
+
+    def do_GET(self):
+        if self.down:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        roll = self.rng.random()
+        if roll < self.error_share:
+            status, delay = 503, 0.01
+        elif roll < self.error_share + self.slow_share:
+            status, delay = 200, 0.5
+        else:
+            status, delay = 200, 0.02
+        time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def request(url):
+    response = clients.http_client().get(url)
+    response.raise_for_status()  # httpx.HTTPStatusError carries the 503 for is_transient
+    return response.text
+
+
+def run(name, url, n, policy=None, breaker=None):
+    latencies, ok = [], 0
+    for _ in range(n):
+        start = time.perf_counter()
+        try:
+            if policy is None:
+                request(url)
+            else:
+                call_sync(lambda: request(url), policy, breaker)
+            ok += 1
+        except Exception:
+            pass
+        latencies.append(time.perf_counter() - start)
+    print(f"{name:<22}{ok / n:>8.1%}{percentile(latencies, 50) * 1000:>9.1f}"
+          f"{percentile(latencies, 95) * 1000:>9.1f}{percentile(latencies, 99) * 1000:>9.1f}")
+
+
+def main(n=300):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    print(f"{'mode':<22}{'success':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    run("no policy", url, n)
+    run("retries", url, n, CallPolicy(deadline=2.0))
+    run("retries + hedge 0.1s", url, n, CallPolicy(deadline=2.0, hedge_after=0.1))
+    print(f"call stats: {dict(call_stats)}")
+    print(f"connections: {clients.http_stats.snapshot()}")
+
+    FakeApi.down = True
+    breaker = CircuitBreaker("fake-api", failure_threshold=3, reset_after=60)
+    run("server down, breaker", url, 20, CallPolicy(deadline=2.0, attempts=2), breaker)
+    print(f"breaker state: {breaker.state}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
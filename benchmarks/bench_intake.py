@@ -0,0 +1,180 @@
+"""Time each stage of resume intake on a corpus of synthetic PDFs.
+
+Resumes of varying length and skill density are generated with reportlab
+(same seed, same corpus), then every document goes through the stages the
+app runs on an upload, each timed on its own:
+
+    extract     ResumeDocument.raw_text (fitz page text, as the app reads it)
+    parse       clean_text (normalisation + extract_info)
+    preprocess  preprocess_text
+    vectorize   vectorizer.transform
+    decision    model.decision_function
+
+p50/p95 latency and documents/sec are reported per stage. --save-baseline
+stores them as JSON; later runs compare against that file and exit 1 if any
+stage's p50 or p95 is more than --threshold slower. Baselines are machine
+specific, so save one on the machine that runs the comparison; a baseline
+recorded with a different --docs or --seed is refused.
+
+Run from the repository root:
+    python benchmarks/bench_intake.py --save-baseline
+    python benchmarks/bench_intake.py
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import jobrole_prediction
+import resume_parsing
+from resume_document import ResumeDocument
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baselines', 'intake.json')
+STAGES = ["extract", "parse", "preprocess", "vectorize", "decision"]
+
+FILLER = ("worked with the team on delivery of projects for clients and improved the "
+          "process by designing reviewing and maintaining services across several releases").split()
+FIRST_NAMES = ["Asha", "Rahul", "Maria", "John", "Wei", "Fatima", "Carlos", "Priya"]
+LAST_NAMES = ["Sharma", "Smith", "Garcia", "Chen", "Khan", "Iyer", "Brown", "Nair"]
+
+
+def make_resume(rng, pages, skill_density):
+    """One synthetic resume PDF; skill_density is the share of body words that are skills"""
+    skills = resume_parsing.tech_skills
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", "")
+    header = [
+        name,
+        f"{handle}@example.com   +91 9{rng.randrange(10 ** 8, 10 ** 9)}",
+        f"https://linkedin.com/in/{handle}   https://github.com/{handle}",
+        "Skills: " + ", ".join(rng.sample(skills, 8)),
+    ]
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    for page in range(pages):
+        lines = header if page == 0 else []
+        y = 740
+        for line in lines:
+            c.drawString(72, y, line)
+            y -= 16
+        while y > 60:
+            words = [rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER)
+                     for _ in range(12)]
+            c.drawString(72, y, " ".join(words))
+            y -= 16
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def make_corpus(n_docs, seed=0):
+    rng = random.Random(seed)
+    return [make_resume(rng, rng.randint(1, 4), rng.choice([0.02, 0.1, 0.3])) for _ in range(n_docs)]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def run_stages(corpus):
+    """Per-stage latencies in seconds, one list per stage"""
+    model, vectorizer = jobrole_prediction.get_model_and_vectorizer()
+    lemma_sources = jobrole_prediction.model_holder.lemma_sources()
+    timings = {stage: [] for stage in STAGES}
+
+    def timed(stage, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings[stage].append(time.perf_counter() - start)
+        return result
+
+    def extract(data):
+        return ResumeDocument(data).raw_text
+
+    for data in corpus:
+        text = timed("extract", extract, data)
+        timed("parse", resume_parsing.clean_text, text)
+        cleaned = timed("preprocess", jobrole_prediction.preprocess_text, text, lemma_sources)
+        X = timed("vectorize", vectorizer.transform, [cleaned])
+        timed("decision", model.decision_function, X)
+    return timings
+
+
+def summarize(timings):
+    return {
+        stage: {
+            "p50_ms": round(percentile(times, 50) * 1000, 4),
+            "p95_ms": round(percentile(times, 95) * 1000, 4),
+            "docs_per_sec": round(len(times) / sum(times), 1),
+        }
+        for stage, times in timings.items()
+    }
+
+
+def compare(summary, baseline, threshold):
+    """Return a message for every stage slower than the baseline by more than threshold"""
+    failures = []
+    for stage, stats in summary.items():
+        base = baseline.get(stage)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if stats[metric] > base[metric] * (1 + threshold):
+                failures.append(f"{stage} {metric}: {stats[metric]:.3f} ms vs baseline {base[metric]:.3f} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume intake pipeline.")
+    parser.add_argument("-n", "--docs", type=int, default=200, help="synthetic resumes to generate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run's results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a stage counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.docs, args.seed)
+    print(f"generated {len(corpus)} resumes ({sum(map(len, corpus)) / 1024:.0f} KiB)")
+    jobrole_prediction.warm_up()
+    run_stages(corpus[:5])  # warm caches and lazy imports outside the measurement
+    summary = summarize(run_stages(corpus))
+
+    print(f"{'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'docs/sec':>12}")
+    for stage, stats in summary.items():
+        print(f"{stage:<12}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['docs_per_sec']:>12.1f}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({"docs": args.docs, "seed": args.seed, "stages": summary}, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against; run with --save-baseline first")
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    if (baseline.get("docs"), baseline.get("seed")) != (args.docs, args.seed):
+        print(f"baseline was recorded with --docs {baseline.get('docs')} --seed {baseline.get('seed')}; "
+              f"re-run with those or save a new baseline")
+        return 2
+    failures = compare(summary, baseline["stages"], args.threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if not failures:
+        print(f"all stages within {args.threshold:.0%} of the baseline")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
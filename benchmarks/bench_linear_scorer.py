@@ -0,0 +1,66 @@
+"""Check LinearScorer against sklearn's transform + decision_function and time both.
+
+Run from the repository root:
+    python benchmarks/bench_linear_scorer.py
+"""
+import os
+import random
+import string
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import jobrole_prediction
+from linear_scorer import LinearScorer
+
+
+def make_corpus(vocabulary, n_docs, rng):
+    # Already preprocessed documents: vocabulary terms plus out-of-vocabulary noise
+    terms = sorted(vocabulary)
+    docs = []
+    for _ in range(n_docs):
+        words = [rng.choice(terms) if rng.random() < 0.7
+                 else "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+                 for _ in range(rng.randint(50, 1500))]
+        docs.append(" ".join(words))
+    return docs
+
+
+def main(n_docs=2000, k=2):
+    model, vectorizer = jobrole_prediction.load_model_and_vectorizer()
+    scorer = LinearScorer(model, vectorizer, jobrole_prediction.y_list)
+    corpus = make_corpus(vectorizer.vocabulary_, n_docs, random.Random(0))
+
+    expected = model.decision_function(vectorizer.transform(corpus))
+    for doc, row in zip(corpus, expected):
+        np.testing.assert_allclose(scorer.decision_scores(doc.split()), row, rtol=1e-9, atol=1e-12)
+    print(f"scores match sklearn for {n_docs} documents")
+
+    # sklearn one document at a time, as predict() did
+    start = time.perf_counter()
+    for doc in corpus:
+        scores = model.decision_function(vectorizer.transform([doc]))[0]
+        scores.argsort()[-k:][::-1]
+    single_secs = time.perf_counter() - start
+
+    # sklearn batched, as predict_batch() does
+    start = time.perf_counter()
+    scores = model.decision_function(vectorizer.transform(corpus))
+    np.argsort(-scores, axis=1)[:, :k]
+    batch_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for doc in corpus:
+        scorer.top_k(doc.split(), k)
+    scorer_secs = time.perf_counter() - start
+
+    for name, secs in [("sklearn per document", single_secs), ("sklearn batched", batch_secs),
+                       ("LinearScorer", scorer_secs)]:
+        print(f"{name:<22} {n_docs / secs:>10,.0f} docs/sec")
+
+
+if __name__ == "__main__":
+    main()
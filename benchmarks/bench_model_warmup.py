@@ -0,0 +1,44 @@
+"""Time job-role predictions with a cold model holder versus a warm one.
+
+Run from the repository root (run app/setup_nltk.py first):
+    python benchmarks/bench_model_warmup.py
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import jobrole_prediction
+
+SAMPLE = ("Experienced data scientist skilled in Python, machine learning, deep learning, "
+          "SQL and cloud deployment. Built recommendation systems and dashboards. ") * 20
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(repeat=20):
+    jobrole_prediction.preprocess_text(SAMPLE)  # load WordNet outside the timings
+
+    # Cold: every prediction unpickles the model, as predict() used to
+    cold = []
+    for _ in range(repeat):
+        jobrole_prediction.model_holder = jobrole_prediction.ModelHolder()
+        cold.append(timed(lambda: jobrole_prediction.predict_batch([SAMPLE])))
+
+    # Warm: one holder shared by every prediction
+    jobrole_prediction.warm_up()
+    warm = [timed(lambda: jobrole_prediction.predict_batch([SAMPLE])) for _ in range(repeat)]
+
+    print(f"cold prediction: median {statistics.median(cold):.2f} ms")
+    print(f"warm prediction: median {statistics.median(warm):.2f} ms")
+    print(f"speedup: {statistics.median(cold) / statistics.median(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
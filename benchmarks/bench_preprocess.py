@@ -0,0 +1,88 @@
+"""Check the fast preprocessing path against the original NLTK one and time both.
+
+The original path ran word_tokenize and WordNetLemmatizer.lemmatize on every
+token. The check fails if the two give different TF-IDF vectors for any
+document in the sample corpus.
+
+word_tokenize first splits sentences with punkt_tab, which setup_nltk.py does
+not download. Text reduced to lowercase letters and spaces is always one
+sentence, so the original path is reproduced with NLTKWordTokenizer, the
+tokenizer word_tokenize applies to each sentence, and needs no extra data.
+
+Run from the repository root (after app/setup_nltk.py):
+    python benchmarks/bench_preprocess.py
+"""
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from nltk.tokenize import NLTKWordTokenizer
+
+import jobrole_prediction
+
+_word_tokenizer = NLTKWordTokenizer()
+
+
+def original_preprocess_text(text):
+    stop_words, lemmatizer = jobrole_prediction.nltk_resources()
+    text = re.sub(r'[^a-zA-Z ]', ' ', text).lower()
+    tokens = _word_tokenizer.tokenize(text)
+    tokens = [lemmatizer.lemmatize(word) for word in tokens if word not in stop_words]
+    return ' '.join(tokens)
+
+
+def make_corpus(vocabulary, n_docs, words_per_doc, rng):
+    terms = sorted(vocabulary)
+    # Vocabulary terms, their inflected forms, irregular plurals, contractions,
+    # stop words and out-of-vocabulary noise, with punctuation and digits mixed in
+    extras = ["analyses", "criteria", "data", "cannot", "gonna", "wanna", "gotta",
+              "companies", "businesses", "teams", "the", "and", "with", "C++", "node.js"]
+    docs = []
+    for _ in range(n_docs):
+        words = []
+        for _ in range(words_per_doc):
+            r = rng.random()
+            if r < 0.45:
+                word = rng.choice(terms)
+            elif r < 0.65:
+                word = rng.choice(terms) + rng.choice(["s", "es", "ies", "ing", "ed"])
+            elif r < 0.75:
+                word = rng.choice(extras)
+            else:
+                word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+            if rng.random() < 0.1:
+                word = word.capitalize() + rng.choice([",", ".", " 2021", " -", ":"])
+            words.append(word)
+        docs.append(" ".join(words))
+    return docs
+
+
+def main(n_docs=200, words_per_doc=800):
+    _, vectorizer = jobrole_prediction.get_model_and_vectorizer()
+    corpus = make_corpus(vectorizer.vocabulary_, n_docs, words_per_doc, random.Random(0))
+    n_tokens = sum(len(doc.split()) for doc in corpus)
+
+    jobrole_prediction.warm_up()
+    start = time.perf_counter()
+    old = [original_preprocess_text(doc) for doc in corpus]
+    old_secs = time.perf_counter() - start
+
+    jobrole_prediction._lemmatize.cache_clear()
+    start = time.perf_counter()
+    new = [jobrole_prediction.preprocess_for_model(doc) for doc in corpus]
+    new_secs = time.perf_counter() - start
+
+    diff = vectorizer.transform(old) - vectorizer.transform(new)
+    assert abs(diff).max() == 0, "fast preprocessing changed the TF-IDF features"
+    print(f"parity: identical TF-IDF vectors for {n_docs} documents")
+    print(f"original: {n_tokens / old_secs:,.0f} tokens/sec")
+    print(f"fast:     {n_tokens / new_secs:,.0f} tokens/sec ({old_secs / new_secs:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare the old per-skill regex loop with the SkillMatcher automaton.
+
+Run from the repository root:
+    python benchmarks/bench_skill_matching.py
+"""
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from skill_matcher import SkillMatcher
+
+BUILTIN_SKILLS = [
+    "python", "java", "c++", "javascript", "typescript", "html", "css", "sql",
+    "mongodb", "mysql", "postgresql", "firebase", "react", "angular", "vue",
+    "node.js", "express", "django", "flask", "spring boot", "git", "github",
+    "docker", "kubernetes", "aws", "azure", "gcp", "linux", "tensorflow",
+    "keras", "pytorch", "scikit-learn", "pandas", "numpy", "opencv",
+    "matplotlib", "seaborn", "hadoop", "spark", "airflow", "bash", "rest api",
+    "graphql", "redis", "postgres", "jupyter", "vs code", "tableau", "power bi",
+    "bigquery", "fastapi", "langchain", "transformers", "huggingface", "llm",
+    "prompt engineering", "fine-tuning", "streamlit", "gradio", "cv2",
+]
+
+
+def regex_loop(text, skill_list):
+    # The original resume_parsing.extract_skills implementation
+    text_lower = text.lower()
+    found = set()
+    for skill in skill_list:
+        if re.search(rf'\b{re.escape(skill.lower())}\b', text_lower):
+            found.add(skill.lower())
+    return list(found)
+
+
+def make_skills(n, rng):
+    skills = list(BUILTIN_SKILLS)
+    while len(skills) < n:
+        words = rng.randint(1, 3)
+        skills.append(" ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(words)
+        ))
+    return skills[:n]
+
+
+def make_resume(skills, rng, words=1500):
+    filler = ["experience", "team", "project", "developed", "using", "built",
+              "managed", "data", "system", "design", "with", "and", "the"]
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(skills) if rng.random() < 0.05 else rng.choice(filler))
+    return " ".join(out)
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'skills':>8} {'regex loop ms':>14} {'matcher ms':>11} {'build ms':>9} {'speedup':>8}")
+    for n in (60, 1000, 10000):
+        skills = make_skills(n, rng)
+        text = make_resume(skills, rng)
+        build_ms = timed(lambda: SkillMatcher(skills), 1)
+        matcher = SkillMatcher(skills)
+        # The regex loop never matches skills ending in punctuation ("c++"), the matcher does
+        diff = set(regex_loop(text, skills)) ^ matcher.skills(text)
+        assert all(not skill[-1].isalnum() for skill in diff), diff
+        repeat = 20 if n <= 1000 else 3
+        loop_ms = timed(lambda: regex_loop(text, skills), repeat)
+        match_ms = timed(lambda: matcher.skills(text), repeat)
+        print(f"{n:>8} {loop_ms:>14.2f} {match_ms:>11.2f} {build_ms:>9.1f} {loop_ms / match_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Latency and real-time factor of each speech-to-text backend.
+
+Every clip is transcribed through stt.transcribe_audio, the same path the app
+uses. The real-time factor (RTF) is transcription time divided by clip length,
+so below 1 is faster than real time. Model loading is timed separately since
+the app does it once per process.
+
+Clips are the WAV files in benchmarks/clips (or --clips). When there are none,
+synthetic voiced clips are generated; they give timings but no meaningful
+transcripts.
+
+Run from the repository root:
+    python benchmarks/bench_stt.py --backends google faster-whisper vosk
+"""
+import argparse
+import glob
+import io
+import math
+import os
+import random
+import statistics
+import struct
+import sys
+import time
+import wave
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import stt
+
+CLIPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'clips')
+
+
+def synthetic_clip(seconds, rate=stt.SAMPLE_RATE, seed=0):
+    """Voiced-sounding bursts: a wandering fundamental with harmonics, separated by short pauses"""
+    rng = random.Random(seed)
+    frames = []
+    t = 0
+    while t < seconds * rate:
+        burst = int(rng.uniform(0.2, 0.5) * rate)
+        f0 = rng.uniform(100, 220)
+        for i in range(burst):
+            phase = 2 * math.pi * f0 * i / rate
+            value = sum(math.sin(k * phase) / k for k in range(1, 6)) * 0.3
+            frames.append(int(max(-1, min(1, value)) * 32767))
+        pause = int(rng.uniform(0.05, 0.15) * rate)
+        frames.extend([0] * pause)
+        t += burst + pause
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(struct.pack(f"<{len(frames)}h", *frames))
+    return buf.getvalue()
+
+
+def duration(audio):
+    with wave.open(io.BytesIO(audio)) as w:
+        return w.getnframes() / w.getframerate()
+
+
+def load_clips(directory):
+    paths = sorted(glob.glob(os.path.join(directory, '*.wav')))
+    if paths:
+        clips = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                clips.append((os.path.basename(path), f.read()))
+        return clips
+    print(f"no clips in {directory}; using synthetic clips (timings only)")
+    return [(f"synthetic-{s}s", synthetic_clip(s, seed=s)) for s in (3, 6, 10, 15)]
+
+
+def bench(name, model, clips, repeat):
+    start = time.perf_counter()
+    try:
+        backend = stt.get_backend(name, model)
+    except Exception as e:
+        print(f"{name:<16}skipped: {e}")
+        return
+    load_ms = (time.perf_counter() - start) * 1000
+    latencies, rtfs = [], []
+    for _ in range(repeat):
+        for clip, audio in clips:
+            start = time.perf_counter()
+            text = stt.transcribe_audio(audio, backend=backend)
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed * 1000)
+            rtfs.append(elapsed / duration(audio))
+            if text in (None, "[API unavailable]"):
+                print(f"{name:<16}failed on {clip}: {text}")
+                return
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name:<16}{load_ms:>10.0f}{statistics.median(latencies):>10.0f}{p95:>10.0f}"
+          f"{statistics.mean(rtfs):>10.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(stt.BACKENDS))
+    parser.add_argument("--model", help="STT_MODEL for the local backends")
+    parser.add_argument("--clips", default=CLIPS_DIR)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    clips = load_clips(args.clips)
+    total = sum(duration(audio) for _, audio in clips)
+    print(f"{len(clips)} clips, {total:.1f}s of audio, {args.repeat} passes, {stt.STT_WORKERS} workers")
+    print(f"{'backend':<16}{'load ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'RTF':>10}")
+    for name in args.backends:
+        bench(name, args.model, clips, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Fail if importing the app modules gets slow again.
+
+Imports the modules in a fresh interpreter with `python -X importtime`. It
+fails when any module that should only load on first use shows up, or when the
+total import time goes over the budget.
+
+    python benchmarks/import_budget.py [--budget-ms 150]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app')
+
+MODULES = ["resume_parsing", "jobrole_prediction", "stt", "Interview_evaluation", "batch_ingest"]
+
+# Heavy packages that must only be imported lazily, on first use
+LAZY = ["nltk", "sklearn", "fitz", "pymupdf", "numpy", "google.generativeai",
+        "elevenlabs", "httpx", "reportlab", "speech_recognition",
+        "faster_whisper", "vosk"]
+
+
+def measure(modules):
+    """Return {module: cumulative import microseconds} for a cold interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=APP_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    args = parser.parse_args(argv)
+
+    times = measure(MODULES)
+    # Modules listed in one import statement don't overlap in cumulative time
+    total_ms = sum(times.get(name, 0) for name in MODULES) / 1000
+    eager = [name for name in times if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY)]
+
+    for name in MODULES:
+        print(f"{times.get(name, 0) / 1000:8.1f} ms  {name}")
+    print(f"total {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if eager:
+        print("imported at startup but should be lazy: " + ", ".join(sorted(eager)))
+        failed = True
+    if total_ms > args.budget_ms:
+        print("import time budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())